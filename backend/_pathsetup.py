@@ -0,0 +1,12 @@
+"""Make the backend directory importable (``import app``) for scripts run from it.
+
+Importing this module is idempotent: Python caches it in ``sys.modules``, so the
+``sys.path`` check below runs once per process no matter how many scripts import it.
+"""
+import sys
+from pathlib import Path
+
+BACKEND_DIR = str(Path(__file__).resolve().parent)
+
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
@@ -2,7 +2,7 @@ import os
 from typing import Generator
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import scoped_session, sessionmaker
 
@@ -18,6 +18,19 @@ engine = create_engine(
     connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},
 )
 
+if DATABASE_URL.startswith("sqlite"):
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_conn, _record) -> None:
+        """WAL keeps readers off the writer's lock; NORMAL sync is durable under WAL and avoids an fsync per commit."""
+        cursor = dbapi_conn.cursor()
+        try:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        finally:
+            cursor.close()
+
+
 # Create a scoped session factory
 SessionLocal = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=engine))
 
@@ -60,6 +73,13 @@ def init_db() -> None:
                 # messages.metadata
                 if not col_exists("messages", "metadata"):
                     conn.execute(text("ALTER TABLE messages ADD COLUMN metadata TEXT"))
+                # messages (conversation_id, role, created_at) index for per-turn history lookups
+                conn.execute(
+                    text(
+                        "CREATE INDEX IF NOT EXISTS ix_messages_conv_role_created "
+                        "ON messages (conversation_id, role, created_at)"
+                    )
+                )
     except Exception as e:
         print(f"Warning: SQLite migration step failed: {e}")
     print("Database tables created successfully!")
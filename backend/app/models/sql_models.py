@@ -1,7 +1,7 @@
 from datetime import datetime, timezone
 from uuid import uuid4
 
-from sqlalchemy import JSON, Boolean, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import JSON, Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -79,6 +79,11 @@ class Message(Base):
     # Relationships
     conversation = relationship("Conversation", back_populates="messages")
 
+    # Per-turn lookups filter by conversation and role, newest first
+    __table_args__ = (
+        Index("ix_messages_conv_role_created", "conversation_id", "role", "created_at"),
+    )
+
     def __repr__(self):
         return f"<Message(id='{self.id}', role='{self.role}')>"
 
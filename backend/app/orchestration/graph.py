@@ -1,5 +1,6 @@
 from typing import Any, Dict, List
 from dataclasses import dataclass
+from functools import lru_cache
 import logging
 
 from .llm import llm_structured
@@ -240,6 +241,8 @@ class Orchestrator:
 
 # Helpers
 
+# Pure decision over hashable primitives, so results are memoized across retried/duplicate turns
+@lru_cache(maxsize=256)
 def invite_gate(
     *,
     phase: str,
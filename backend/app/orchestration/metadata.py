@@ -35,7 +35,14 @@ def normalize_meta(meta: Dict[str, Any]) -> Dict[str, Any]:
     - Ensures missing keys exist with safe defaults.
     - Coerces types of common fields.
     """
-    out: Dict[str, Any] = dict(meta or {})
+    return normalize_meta_inplace(dict(meta or {}))
+
+
+def normalize_meta_inplace(out: Dict[str, Any]) -> Dict[str, Any]:
+    """Same as normalize_meta, but mutates and returns the given dict.
+
+    Use when the caller owns a freshly built dict and does not need the original.
+    """
     out.setdefault("phase", "intake")
     out.setdefault("advice_intent", False)
     out.setdefault("safety_flag_this_turn", False)
@@ -1,26 +1,46 @@
 from __future__ import annotations
 
-import json
 import os
 import re
-from typing import List, Tuple
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
-# Simple module-level cache
-_TITLES: List[str] | None = None
-_AUTHORS: List[str] | None = None
+from ..pastoral.rules import RULES_DIR, get_rules
+
+_RULES_PATH = RULES_DIR / "marriage.json"
+
+# Generic patterns, compiled once: URLs, quoted titles, explicit resource words, "by <Name>"
+_URL_RE = re.compile(r"https?://\S+", re.I)
+_QUOTED_TITLE_RE = re.compile(r"[\u201C\u201D\"]([^\u201C\u201D\"]{2,})[\u201C\u201D\"]", re.I)  # “Title” or "Title"
+_WORKBOOK_RE = re.compile(
+    r"\b(?:book|devotional|study|workbook|resource|author|curriculum)\b\s+(?:called|named|titled)?\s*[\u201C\u201D\"]?[^\s,.;:!?]{2,}",
+    re.I,
+)
+_BY_AUTHOR_RE = re.compile(r"\bby\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+){0,3}", re.I)
+# All generic patterns fused into one alternation: a single sweep over the text (earliest match wins,
+# ties go to the order above) instead of one pass each, and replacements are never re-scanned.
+_GENERIC_SCAN_RE = re.compile(
+    "|".join(f"(?:{p.pattern})" for p in (_URL_RE, _QUOTED_TITLE_RE, _WORKBOOK_RE, _BY_AUTHOR_RE)),
+    re.I,
+)
+
+# Whitespace cleanup and stray punctuation
+_MULTI_SPACE_RE = re.compile(r"\s{2,}")
+_SPACE_BEFORE_PUNCT_RE = re.compile(r"\s+[.,;:!?]")
+
+
+def _rules_mtime() -> Optional[int]:
+    try:
+        return os.stat(_RULES_PATH).st_mtime_ns
+    except OSError:
+        return None
 
 
 def _load_resources() -> Tuple[List[str], List[str]]:
-    global _TITLES, _AUTHORS
-    if _TITLES is not None and _AUTHORS is not None:
-        return _TITLES, _AUTHORS
-    base_dir = os.path.dirname(os.path.dirname(__file__))
-    rules_path = os.path.join(base_dir, "pastoral", "rules", "marriage.json")
     titles: List[str] = []
     authors: List[str] = []
     try:
-        with open(rules_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = get_rules("marriage")
         # Expected structure: { books: [ { key, pretty, author, ... }, ... ] }
         books = data.get("books") or []
         for b in books:
@@ -33,10 +53,26 @@ def _load_resources() -> Tuple[List[str], List[str]]:
     except Exception:
         # Fallback to empty lists if file missing or invalid
         titles, authors = [], []
-    _TITLES, _AUTHORS = titles, authors
     return titles, authors
 
 
+def _alternation(names: List[str]) -> Optional[re.Pattern]:
+    if not names:
+        return None
+    # Longest first so a title that prefixes another never wins the alternation
+    escaped = [re.escape(n) for n in sorted(set(names), key=len, reverse=True)]
+    return re.compile(r"(?:" + "|".join(escaped) + r")", re.I)
+
+
+@lru_cache(maxsize=1)
+def _known_patterns(rules_mtime: Optional[int]) -> Tuple[re.Pattern, ...]:
+    """One compiled alternation over every known title and author, so the text is swept once
+    however many books marriage.json lists; keyed on the rules file mtime so edits are picked up."""
+    titles, authors = _load_resources()
+    combined = _alternation(titles + authors)
+    return (combined,) if combined is not None else ()
+
+
 def scrub_books_if_gated(text: str, allow_books: bool) -> Tuple[str, List[str]]:
     """Scrub book/resource mentions when gating disallows them.
 
@@ -45,30 +81,9 @@ def scrub_books_if_gated(text: str, allow_books: bool) -> Tuple[str, List[str]]:
     if allow_books:
         return text, []
 
-    titles, authors = _load_resources()
     to_scrub: List[str] = []
     original = text or ""
 
-    # Known titles/authors (escape for regex)
-    title_patterns = [re.escape(t) for t in titles if t]
-    author_patterns = [re.escape(a) for a in authors if a]
-
-    # Generic patterns: quoted titles, explicit resource words, URLs, "by <Name>"
-    generic_patterns = [
-        r"https?://\S+",  # URLs
-        r"[\u201C\u201D\"]([^\u201C\u201D\"]{2,})[\u201C\u201D\"]",  # “Title” or "Title"
-        r"\b(?:book|devotional|study|workbook|resource|author|curriculum)\b\s+(?:called|named|titled)?\s*[\u201C\u201D\"]?[^\s,.;:!?]{2,}",
-        r"\bby\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+){0,3}",
-    ]
-
-    patterns: List[Tuple[re.Pattern, str]] = []
-    if title_patterns:
-        patterns.append((re.compile(r"(?:" + "|".join(title_patterns) + r")", re.I), "title"))
-    if author_patterns:
-        patterns.append((re.compile(r"(?:" + "|".join(author_patterns) + r")", re.I), "author"))
-    for gp in generic_patterns:
-        patterns.append((re.compile(gp, re.I), "generic"))
-
     def repl(match: re.Match) -> str:
         val = match.group(0)
         # Capture recognizable title/author tokens for metadata
@@ -80,12 +95,12 @@ def scrub_books_if_gated(text: str, allow_books: bool) -> Tuple[str, List[str]]:
         return "[resource removed]"
 
     cleaned = original
-    for pat, _kind in patterns:
+    for pat in _known_patterns(_rules_mtime()) + (_GENERIC_SCAN_RE,):
         cleaned = pat.sub(repl, cleaned)
 
     # Minor whitespace cleanup and stray punctuation
-    cleaned = re.sub(r"\s{2,}", " ", cleaned)
-    cleaned = re.sub(r"\s+[.,;:!?]", lambda m: m.group(0).strip(), cleaned)
+    cleaned = _MULTI_SPACE_RE.sub(" ", cleaned)
+    cleaned = _SPACE_BEFORE_PUNCT_RE.sub(lambda m: m.group(0).strip(), cleaned)
     cleaned = cleaned.strip()
 
     return cleaned, to_scrub
@@ -0,0 +1,27 @@
+# Topic rules registry (pastoral/rules/<topic>.json)
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+RULES_DIR = Path(__file__).resolve().parent
+
+# Parsed rules keyed by (topic, file mtime_ns): one read + decode per file version per process.
+# Callers share the returned dict and must treat it as read-only.
+_CACHE: Dict[Tuple[str, int], Dict[str, Any]] = {}
+
+
+def get_rules(topic: str) -> Dict[str, Any]:
+    """Parsed `<topic>.json`, re-read only when the file changes. Raises OSError/ValueError if unreadable."""
+    p = RULES_DIR / f"{topic}.json"
+    k = (topic, p.stat().st_mtime_ns)
+    rules = _CACHE.get(k)
+    if rules is None:
+        with p.open("r", encoding="utf-8") as f:
+            rules = json.load(f)
+        # Drop superseded versions of this topic
+        for stale in [key for key in _CACHE if key[0] == topic]:
+            del _CACHE[stale]
+        _CACHE[k] = rules
+    return rules
@@ -3,10 +3,10 @@ from typing import List, Tuple
 from .response_plan import ResponsePlan
 
 
-def validate_response_plan(plan: ResponsePlan) -> Tuple[bool, List[str]]:
+def validate_response_plan(plan: ResponsePlan) -> Tuple[bool, Tuple[str, ...]]:
     """Validate a ResponsePlan beyond basic Pydantic constraints.
 
-    Returns (ok, errors)
+    Returns (ok, errors); errors is an immutable tuple (empty when ok)
     """
     errors: List[str] = []
 
@@ -62,4 +62,4 @@ def validate_response_plan(plan: ResponsePlan) -> Tuple[bool, List[str]]:
     if not (isinstance(ta, str) and ta.strip() and len(ta.strip()) >= 10):
         errors.append("truth_anchor is missing or too trivial")
 
-    return (len(errors) == 0, errors)
+    return (len(errors) == 0, tuple(errors))
@@ -1,27 +1,20 @@
 from __future__ import annotations
 
-import json
-import os
 from typing import List
 
+from ..pastoral.rules import get_rules
+
 # Lightweight loader for paraphrased, title-free insight clauses.
 # Pulls short, actionable principles from vetted rules JSON.
 
-def _rules_path() -> str:
-    base_dir = os.path.dirname(os.path.dirname(__file__))
-    return os.path.join(base_dir, "pastoral", "rules", "marriage.json")
-
-
 def get_insight_clauses(topic: str | None = None, limit: int = 8) -> List[str]:
     """Return up to `limit` short insight clauses for the given topic.
 
     Currently sources from marriage.json book_sources fields like
     key_principles/practical_patterns/principles/core_convictions.
     """
-    path = _rules_path()
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = get_rules("marriage")
     except Exception:
         return []
 
@@ -0,0 +1,188 @@
+"""Per-turn conversation metadata heuristics for the legacy chat path.
+
+Pure string/regex/dict work with no DB or settings access, kept apart from
+ChatService so it can be profiled and tested on its own.
+"""
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, Optional, Tuple
+
+GREETINGS = ["hello", "hi", "hey", "good morning", "good afternoon", "good evening"]
+
+# Years married (e.g., "married 10 years", "for 3 yrs", "been married 1 year"); first match wins
+_MARRIAGE_YEARS_PATTERNS = tuple(
+    re.compile(p)
+    for p in (
+        r"\bmarried\s+(?:for\s+)?(\d{1,2})\s*(?:years|yrs|yr|year)s?\b",
+        r"\b(\d{1,2})\s*(?:years|yrs|yr|year)s?\s+(?:of\s+)?marriage\b",
+        r"\bfor\s+(\d{1,2})\s*(?:years|yrs|yr|year)s?\b.*\bmarried\b",
+    )
+)
+_MARRIAGE_MONTHS_PATTERN = re.compile(r"\bmarried\s+(?:for\s+)?(\d{1,2})\s*(?:months|mos|mo)\b")
+
+_NO_CHILDREN_RE = re.compile(r"\bno\s+(kids|children)\b|\bwithout\s+(kids|children)\b|\bno children yet\b")
+_CHILDREN_COUNT_RE = re.compile(r"\b(\d{1,2})\s*(kids|children)\b")
+_CHILDREN_ANY_RE = re.compile(r"\b(kids|children)\b|\bexpecting\b|\bpregnant\b")
+_COUNSELING_RE = re.compile(r"\b(counseling|counselling|counselor|counsellor|therapy|therapist)\b")
+_COUNSELING_NEG_RE = re.compile(r"\b(never|no|haven't|havent|didn't|didnt|not)\b.{0,12}\b(counsel|therapy|counseling)\b")
+
+_FAITH_CHRISTIAN_RE = re.compile(r"\b(i am|i'm)\s+(a\s+)?(christian|believer|follower of jesus)\b")
+_FAITH_NOT_CHRISTIAN_RE = re.compile(r"\b(i am|i'm)\s+(not\s+)?(christian|religious)\b|\b(agnostic|atheist)\b")
+_FAITH_EXPLORING_RE = re.compile(r"\b(i am|i'm)\s+(just\s+)?exploring( faith)?\b")
+# Runs on the raw assistant reply, hence re.I
+_FAITH_QUESTION_RE = re.compile(
+    r"are you (a )?follower of jesus|are you christian|are you a christian|exploring faith", re.I
+)
+_CHURCH_RE = re.compile(r"\b(church|small group|community group|pastor)\b")
+_CHURCH_NEG_RE = re.compile(r"\b(no(t)?|don'?t|without|haven't|not in a)\b")
+
+# Scripture reference such as "John 15:5", "1 John 3:1" or "Romans 8:1-4"
+_SCRIPTURE_RE = re.compile(r"\b(?:[1-3]\s*)?[A-Za-z]+\s+\d+:\d+(?:-\d+)?\b")
+_TRUST_REPAIR_CUES = ("transparency", "weekly actions", "accountability")
+
+# last_intent keyword groups, in priority order (first matching group wins)
+_INTENT_KEYWORD_GROUPS = [
+    ("sexual_integrity", ["porn", "pornography", "lust", "accountability", "filter", "filters"]),
+    ("divorce_or_separation", ["divorce", "separation", "separated"]),
+    ("rebuilding_trust", ["trust", "betrayal", "affair", "adultery"]),
+    ("communication_conflict", ["argue", "conflict", "fight", "communication"]),
+    ("prayer_support", ["pray", "prayer"]),
+    ("greeting", GREETINGS),
+]
+_INTENT_RANK = {label: rank for rank, (label, _kws) in enumerate(_INTENT_KEYWORD_GROUPS)}
+# One named group per label, in priority order, inside a zero-width lookahead: every position is tried in a
+# single left-to-right pass, and `lastgroup` names the highest-priority label matching at that position
+_INTENT_SCAN = re.compile(
+    "(?="
+    + "|".join(
+        f"(?P<{label}>" + "|".join(re.escape(k) for k in sorted(kws, key=len, reverse=True)) + ")"
+        for label, kws in _INTENT_KEYWORD_GROUPS
+    )
+    + ")"
+)
+
+
+def parse_marriage_years(lm: str) -> Optional[int]:
+    """Years married from a lowercased message; months-only answers count as 0 years."""
+    # Every pattern needs "married"/"marriage"; most turns mention neither, so skip the regexes
+    if "marri" not in lm:
+        return None
+    for pat in _MARRIAGE_YEARS_PATTERNS:
+        m = pat.search(lm)
+        if m:
+            return int(m.group(1))
+    if _MARRIAGE_MONTHS_PATTERN.search(lm):
+        return 0
+    return None
+
+
+def parse_children(lm: str) -> Tuple[Optional[bool], Optional[int]]:
+    """(have_children, children_count) from a lowercased message; None where the message says nothing."""
+    if _NO_CHILDREN_RE.search(lm):
+        return False, 0
+    m = _CHILDREN_COUNT_RE.search(lm)
+    if m:
+        return True, int(m.group(1))
+    if _CHILDREN_ANY_RE.search(lm):
+        return True, None
+    return None, None
+
+
+def parse_prior_counseling(lm: str) -> Optional[bool]:
+    """Whether a lowercased message reports prior counseling/therapy; None if it is not mentioned."""
+    if not _COUNSELING_RE.search(lm):
+        return None
+    return not _COUNSELING_NEG_RE.search(lm)
+
+
+def detect_intent(lm: str) -> Optional[str]:
+    """Return the highest-priority last_intent label whose keyword occurs in `lm` (lowercased)."""
+    best: Optional[str] = None
+    best_rank = len(_INTENT_KEYWORD_GROUPS)
+    for m in _INTENT_SCAN.finditer(lm):
+        label = m.lastgroup
+        rank = _INTENT_RANK[label]
+        if rank < best_rank:
+            best, best_rank = label, rank
+            if rank == 0:
+                break
+    return best
+
+
+def update_meta_after_turn(
+    meta: Dict[str, Any],
+    lm: str,
+    am: str,
+    *,
+    consent_detected: bool,
+    faith_branching: bool = True,
+) -> None:
+    """Fold this turn's text signals into conversation metadata, in place.
+
+    `lm` is the lowercased user message and `am` the final assistant reply.
+    Covers marriage facts, prayer consent, last_intent, faith/church signals,
+    the last scripture reference and the trust-repair stage.
+    """
+    try:
+        # Marriage
+        years_val = parse_marriage_years(lm)
+        if years_val is not None:
+            meta["marriage_years"] = years_val
+            # Stage mapping
+            if years_val <= 2:
+                meta["marriage_stage"] = "newly_married"
+            elif years_val <= 10:
+                meta["marriage_stage"] = "mid"
+            else:
+                meta["marriage_stage"] = "long_term"
+
+        # Children
+        have_children, children_count = parse_children(lm)
+        if have_children is not None:
+            meta["have_children"] = have_children
+        if children_count is not None:
+            meta["children_count"] = children_count
+
+        # Prior counseling
+        prior_counseling = parse_prior_counseling(lm)
+        if prior_counseling is not None:
+            meta["prior_counseling"] = prior_counseling
+    except Exception:
+        pass
+
+    if consent_detected:
+        meta["consent_for_prayer"] = True
+    else:
+        meta["consent_for_prayer"] = bool(meta.get("consent_for_prayer", False))
+
+    # Detect last_intent from user message
+    intent = detect_intent(lm)
+    if intent:
+        meta["last_intent"] = intent
+
+    # Faith-aware metadata
+    if faith_branching:
+        # User message signals
+        if _FAITH_CHRISTIAN_RE.search(lm):
+            meta["faith_status"] = "christian"
+        elif _FAITH_NOT_CHRISTIAN_RE.search(lm):
+            meta["faith_status"] = "not_christian"
+        elif _FAITH_EXPLORING_RE.search(lm) or "exploring faith" in lm:
+            meta["faith_status"] = "exploring"
+        # Assistant faith question detection (to avoid repeat)
+        if _FAITH_QUESTION_RE.search(am):
+            meta["asked_faith_question"] = True
+        # Local church detection
+        if _CHURCH_RE.search(lm):
+            meta["has_local_church"] = not _CHURCH_NEG_RE.search(lm)
+
+    # Last scripture used; a reference always has a chapter:verse colon, so skip the regex without one
+    scripture_match = _SCRIPTURE_RE.search(am) if ":" in am else None
+    if scripture_match:
+        meta["last_scripture_used"] = scripture_match.group(0)
+
+    # Heuristic trust rebuild stage
+    am_l = am.lower()
+    if any(k in am_l for k in _TRUST_REPAIR_CUES):
+        meta["trust_rebuild_stage"] = "early_repair"
@@ -0,0 +1,139 @@
+"""OpenAI Batch API path for non-interactive bulk jobs (debug sweeps, regression runs).
+
+Batch requests are billed at half price and draw on a separate rate-limit pool, at the cost of
+up-to-24h turnaround, so they suit scripted runs that never need an answer synchronously.
+Calls go over direct HTTPS like the rest of the service (see orchestration/llm.py).
+"""
+from __future__ import annotations
+
+import json
+import time
+import urllib.error
+import urllib.request
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from ..config import get_settings
+
+API_BASE = "https://api.openai.com/v1"
+CHAT_ENDPOINT = "/v1/chat/completions"
+TERMINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+@dataclass
+class BatchHandle:
+    id: str
+    input_file_id: str
+    status: str
+    output_file_id: Optional[str] = None
+    error_file_id: Optional[str] = None
+
+
+def _api_key(api_key: Optional[str]) -> str:
+    key = (api_key or get_settings().OPENAI_API_KEY or "").strip()
+    if not key:
+        raise RuntimeError("OPENAI_API_KEY missing for batch runner")
+    return key
+
+
+def _request(method: str, path: str, api_key: str, *, body: bytes | None = None, content_type: str | None = None) -> bytes:
+    headers = {"Authorization": f"Bearer {api_key}"}
+    if content_type:
+        headers["Content-Type"] = content_type
+    req = urllib.request.Request(f"{API_BASE}{path}", data=body, headers=headers, method=method)
+    try:
+        with urllib.request.urlopen(req) as resp:
+            return resp.read()
+    except urllib.error.HTTPError as he:
+        detail = None
+        try:
+            detail = he.read().decode("utf-8", errors="ignore")
+        except Exception:
+            detail = None
+        raise RuntimeError(f"OpenAI batch call {method} {path} failed: {he} body={detail}")
+
+
+def _handle_from(data: Dict[str, Any]) -> BatchHandle:
+    return BatchHandle(
+        id=data["id"],
+        input_file_id=data.get("input_file_id") or "",
+        status=data.get("status") or "",
+        output_file_id=data.get("output_file_id"),
+        error_file_id=data.get("error_file_id"),
+    )
+
+
+def build_batch_jsonl(requests: List[Dict[str, Any]], endpoint: str = CHAT_ENDPOINT) -> str:
+    """One batch line per request; each request is {"custom_id": ..., "body": {...}}."""
+    lines = []
+    for r in requests:
+        lines.append(json.dumps({
+            "custom_id": r["custom_id"],
+            "method": "POST",
+            "url": endpoint,
+            "body": r["body"],
+        }))
+    return "\n".join(lines) + "\n"
+
+
+def parse_batch_output(text: str) -> Dict[str, Dict[str, Any]]:
+    """Map custom_id -> response body (or {"error": ...}) from a batch output/error file."""
+    results: Dict[str, Dict[str, Any]] = {}
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        row = json.loads(line)
+        response = row.get("response") or {}
+        results[row.get("custom_id")] = response.get("body") or {"error": row.get("error")}
+    return results
+
+
+def submit_batch(requests: List[Dict[str, Any]], *, endpoint: str = CHAT_ENDPOINT, api_key: Optional[str] = None) -> BatchHandle:
+    """Upload the requests as a batch input file and create the batch (24h completion window)."""
+    key = _api_key(api_key)
+    boundary = uuid.uuid4().hex
+    payload = build_batch_jsonl(requests, endpoint).encode("utf-8")
+    body = b"".join([
+        f'--{boundary}\r\nContent-Disposition: form-data; name="purpose"\r\n\r\nbatch\r\n'.encode("utf-8"),
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="batch.jsonl"\r\n'
+        "Content-Type: application/jsonl\r\n\r\n".encode("utf-8"),
+        payload,
+        f"\r\n--{boundary}--\r\n".encode("utf-8"),
+    ])
+    uploaded = json.loads(_request("POST", "/files", key, body=body, content_type=f"multipart/form-data; boundary={boundary}"))
+    created = json.loads(_request(
+        "POST",
+        "/batches",
+        key,
+        body=json.dumps({
+            "input_file_id": uploaded["id"],
+            "endpoint": endpoint,
+            "completion_window": "24h",
+        }).encode("utf-8"),
+        content_type="application/json",
+    ))
+    return _handle_from(created)
+
+
+def wait_for_batch(handle: BatchHandle, *, poll_interval: float = 30.0, timeout: float = 24 * 3600, api_key: Optional[str] = None) -> BatchHandle:
+    """Poll until the batch reaches a terminal status; raises on timeout."""
+    key = _api_key(api_key)
+    deadline = time.monotonic() + timeout
+    while handle.status not in TERMINAL_STATUSES:
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"Batch {handle.id} still {handle.status!r} after {timeout:.0f}s")
+        time.sleep(poll_interval)
+        handle = _handle_from(json.loads(_request("GET", f"/batches/{handle.id}", key)))
+    return handle
+
+
+def fetch_batch_results(handle: BatchHandle, *, api_key: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """Download and parse the output (and error) files of a finished batch, keyed by custom_id."""
+    key = _api_key(api_key)
+    results: Dict[str, Dict[str, Any]] = {}
+    for file_id in (handle.error_file_id, handle.output_file_id):
+        if file_id:
+            text = _request("GET", f"/files/{file_id}/content", key).decode("utf-8", errors="ignore")
+            results.update(parse_batch_output(text))
+    return results
@@ -8,17 +8,26 @@ import urllib.error
 import os
 import inspect
 import re
-from pathlib import Path
+from sqlalchemy import func
 from sqlalchemy.orm.attributes import flag_modified
 
 # Optional orchestrator (feature-flagged)
 from ..orchestration.graph import Orchestrator, TurnState
 from ..policies.intake import IntakeState
-from ..orchestration.metadata import normalize_meta
+from ..orchestration.metadata import normalize_meta, normalize_meta_inplace
 from ..orchestration.classify import classify
 from ..orchestration.scrubber import scrub_books_if_gated
+from ..pastoral.rules import RULES_DIR, get_rules
+from ._intake_update import (
+    GREETINGS,
+    parse_children,
+    parse_marriage_years,
+    parse_prior_counseling,
+    update_meta_after_turn,
+)
 
 from ..config import get_settings
+from ..db.base import SessionLocal
 from ..models.conversation import (
     Conversation,
     Message,
@@ -30,6 +39,157 @@ from ..models.conversation import (
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Bound once; the legacy path stamps updated_at on every turn
+_UTC = timezone.utc
+
+
+def _union(patterns: List[str], flags: int = 0) -> "re.Pattern[str]":
+    """Fold a list of alternative patterns into one compiled regex (single scan per search)."""
+    return re.compile("|".join(f"(?:{p})" for p in patterns), flags)
+
+
+# Legacy-path heuristics, compiled once at import instead of per turn
+_INVITE_PATTERNS = [
+    r"where do you sense jesus inviting",
+    r"would you like to bring this to jesus",
+    r"pray with jesus",
+    r"bring this to (him|jesus)",
+]
+_DECLINE_PATTERNS = [
+    r"\bno\b",
+    r"\bno thanks\b",
+    r"\bnot (?:now|really|interested|comfortable)\b",
+    r"\brather not\b",
+    r"\bdon't want\b|\bdo not want\b",
+    r"\bstop\b",
+    r"\bplease don't\b|\bplease do not\b",
+]
+_ACCEPT_PATTERNS = [
+    r"\byes\b",
+    r"\bok\b|\bokay\b|\bsure\b",
+    r"\blet's\b|\blets\b",
+    r"\bi will\b|\bi'll\b",
+]
+_CONSENT_YES_PATTERNS = [
+    r"\bplease\s+pray\b",
+    r"\bpray\s+for\s+me\b",
+    r"\byes\b.*\bforward\b.*\bprayer\b",
+    r"\byou\s+can\s+forward\b.*\bprayer\b",
+]
+_CONSENT_NO_PATTERNS = [
+    r"\bno\s+prayer\b",
+    r"\bdo\s+not\s+pray\b|don't\s+pray",
+    r"\bplease\s+don't\s+pray\b",
+]
+_CONFIRM_NOW_PATTERNS = [
+    r"\bthat's enough\b(?:[.,!]|$)",
+    r"\bthats enough\b(?:[.,!]|$)",
+    r"\bwe'?re good\b(?:[.,!]|$)",
+    r"\bready for advice\b",
+    r"\bi'?m ready for advice\b",
+    r"\bi am ready for advice\b",
+    r"\bdone with intake\b",
+    r"\bmove to advice\b",
+    r"\bgo ahead\b",
+]
+# Literal wrap-up phrases (plain substrings, no word boundaries)
+_WRAP_LITERALS = (
+    "that's enough",
+    "thats enough",
+    "ready for advice",
+    "we're good",
+    "we are good",
+    "done with intake",
+    "move to advice",
+    "go ahead",
+)
+
+# Heuristic patterns are lowercase and searched against `.lower()`-ed text, so they compile without re.I;
+# only the invite union also runs on raw assistant text
+_INVITE_UNION = _union(_INVITE_PATTERNS, re.I)
+_DECLINE_UNION = _union(_DECLINE_PATTERNS)
+_ACCEPT_UNION = _union(_ACCEPT_PATTERNS)
+_CONSENT_YES_UNION = _union(_CONSENT_YES_PATTERNS)
+_CONSENT_NO_UNION = _union(_CONSENT_NO_PATTERNS)
+# Wrap-up confirmation: literal substrings and boundary-sensitive forms in one alternation
+_WRAP_CONFIRM_UNION = _union([re.escape(w) for w in _WRAP_LITERALS] + _CONFIRM_NOW_PATTERNS)
+# Greetings are plain substrings (no word boundaries), matching the previous `in` checks
+_GREETING_UNION = _union([re.escape(g) for g in GREETINGS])
+
+# Metadata-update heuristics (conversation-level wrap-up and recent-history intake signals)
+_GOAL_PATTERNS = [
+    r"\bmy goal is\b",
+    r"\bi (?:want|hope|need) to\b",
+    r"\bwe (?:want|hope|need) to\b",
+    r"\bnext steps?\b",
+]
+_PARTNER_PATTERNS = [
+    r"\bhusband\b", r"\bwife\b", r"\bspouse\b", r"\bpartner\b",
+    r"\bgirlfriend\b", r"\bboyfriend\b",
+]
+_TIMEFRAME_PATTERNS = [
+    r"\bthis week\b", r"\bnext (?:few\s+)?weeks\b", r"\bby (?:friday|monday|\d{1,2}/\d{1,2})\b",
+    r"\bwithin (?:a|one)?\s*(?:month|weeks?)\b", r"\bsoon\b",
+]
+_GOAL_UNION = _union(_GOAL_PATTERNS)
+_PARTNER_UNION = _union(_PARTNER_PATTERNS)
+_TIMEFRAME_UNION = _union(_TIMEFRAME_PATTERNS)
+_JESUS_WORD_RE = re.compile(r"\bjesus\b")
+
+
+def _mentions_jesus(lm: str) -> bool:
+    """Whole-word "jesus" in lowercased text; the substring test settles most turns before the regex runs."""
+    return "jesus" in lm and _JESUS_WORD_RE.search(lm) is not None
+
+
+def _meta_int(v: Any, default: int = 0) -> int:
+    """Integer counter from JSON metadata (digit strings accepted) without try/int() round-trips."""
+    if isinstance(v, int):
+        return v
+    if isinstance(v, str) and v.isdigit():
+        return int(v)
+    return default
+
+
+# Top-level metadata keys reported in the legacy path's meta_diff log
+_META_DIFF_KEYS = (
+    "declined_jesus_until_turn",
+    "jesus_decline_count",
+    "last_jesus_invite_turn",
+    "prayer_consent_known",
+    "prayer_consent",
+    "intake_completed",
+    "conversation_phase",
+    "allow_book_insertion_last",
+    "safety_flag_last",
+    "cadence_reason",
+    "allow_jesus_last",
+    "allow_books_last",
+)
+
+
+# IntakeState's boolean checklist fields, as stored under meta["intake"]
+_INTAKE_FLAGS = ("issue_named", "safety_cleared", "goal_captured", "prayer_consent_known")
+
+# Intake snapshot once wrap-up is confirmed: every flag forced True (copy before mutating)
+_INTAKE_ALL_TRUE = {
+    "issue_named": True,
+    "safety_cleared": True,
+    "goal_captured": True,
+    "prayer_consent_known": True,
+    "completed": True,
+}
+
+# Legacy-path Jesus invite suffixes, rotated by assistant turn index (keep the `% 3` in sync)
+_JESUS_INVITE_VARIANTS = (
+    " Where do you sense Jesus inviting you to take one small, grace-filled step this week?",
+    " What might Jesus be leading you to try as a small next step right now?",
+    " How could you bring this to Jesus in a practical way this week?",
+)
+
+# Terminal characters that count as a finished sentence when appending to a reply
+_SENTENCE_END = frozenset(".!?")
+_SENTENCE_END_OR_NL = frozenset(".!?\n")
 
 class ChatService:
     """Service for handling chat functionality with OpenAI's API."""
@@ -157,12 +317,9 @@ class ChatService:
 
         # Load topic rules (lightweight registry)
         try:
-            rules_dir = Path(__file__).resolve().parents[1] / "pastoral" / "rules"
             self.topic_rules: Dict[str, Any] = {}
-            marriage_path = rules_dir / "marriage.json"
-            if marriage_path.exists():
-                with open(marriage_path, "r", encoding="utf-8") as f:
-                    self.topic_rules["marriage"] = json.load(f)
+            if (RULES_DIR / "marriage.json").exists():
+                self.topic_rules["marriage"] = get_rules("marriage")
             logger.info("Loaded topic rules: %s", list(self.topic_rules.keys()))
         except Exception as _e:
             self.topic_rules = {}
@@ -173,7 +330,7 @@ class ChatService:
     ) -> Conversation:
         """Create a new conversation with DB persistence."""
         from ..models.sql_models import Conversation as SQLConversation
-        from ..db.base import SessionLocal, engine
+        from ..db.base import engine
 
         import logging
         import sys
@@ -211,7 +368,7 @@ class ChatService:
 
         # Use a default title if none is provided
         if not title:
-            title = f"Conversation {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')}"
+            title = f"Conversation {datetime.now(_UTC).strftime('%Y-%m-%d %H:%M:%S')}"
             print_debug(f"No title provided, using default: {title}")
 
         db = None
@@ -226,8 +383,8 @@ class ChatService:
                 db_conversation = SQLConversation(
                     user_id=user_id,
                     title=title,
-                    created_at=datetime.now(timezone.utc),
-                    updated_at=datetime.now(timezone.utc),
+                    created_at=datetime.now(_UTC),
+                    updated_at=datetime.now(_UTC),
                     metadata_json=(metadata or {}),
                 )
 
@@ -291,17 +448,25 @@ class ChatService:
         role: MessageRole = MessageRole.USER,
         message_type: MessageType = MessageType.TEXT,
         metadata: Optional[Dict[str, Any]] = None,
+        normalize: bool = False,
     ) -> Message:
-        """Add a message to a conversation with DB persistence."""
+        """Add a message to a conversation with DB persistence.
+
+        With normalize=True the caller-owned metadata dict is normalized in place right before it is stored.
+        """
         from ..models.sql_models import Message as SQLMessage
-        from ..db.base import SessionLocal
+        if normalize and metadata is not None:
+            try:
+                normalize_meta_inplace(metadata)
+            except Exception:
+                pass
         db = SessionLocal()
         try:
             db_msg = SQLMessage(
                 conversation_id=conversation_id,
                 role=role.value if hasattr(role, "value") else str(role),
                 content=content,
-                created_at=datetime.now(timezone.utc),
+                created_at=datetime.now(_UTC),
                 metadata_json=(metadata or {}),
             )
             db.add(db_msg)
@@ -323,16 +488,10 @@ class ChatService:
                 SessionLocal.remove()  # type: ignore[name-defined]
             except Exception:
                 pass
-            try:
-                # Prevent scoped_session from caching objects across calls
-                SessionLocal.remove()  # type: ignore[name-defined]
-            except Exception:
-                pass
 
     async def get_user_conversations(self, user_id: str, skip: int = 0, limit: int = 100) -> tuple[list[Conversation], int]:
         """Return a user's conversations with pagination and total count."""
         from ..models.sql_models import Conversation as SQLConversation
-        from ..db.base import SessionLocal
         db = SessionLocal()
         try:
             q = db.query(SQLConversation).filter(SQLConversation.user_id == user_id)
@@ -363,7 +522,6 @@ class ChatService:
     def _get_turn_indexes(self, conversation_id: str) -> tuple[int, int, str]:
         """Compute assistant/user turn indexes and last assistant text from DB."""
         from ..models.sql_models import Message as SQLMessage
-        from ..db.base import SessionLocal
         db = SessionLocal()
         try:
             rows = (
@@ -388,7 +546,6 @@ class ChatService:
     def _get_history_for_model(self, conversation_id: str, max_turns: int = 8) -> List[Dict[str, str]]:
         """Return [system_first] + last `max_turns` user/assistant turns (2*max_turns msgs)."""
         from ..models.sql_models import Message as SQLMessage
-        from ..db.base import SessionLocal
         db = SessionLocal()
         try:
             rows = (
@@ -416,7 +573,6 @@ class ChatService:
     async def get_conversation(self, conversation_id: str) -> Optional[Conversation]:
         """Return a single conversation by ID or None."""
         from ..models.sql_models import Conversation as SQLConversation
-        from ..db.base import SessionLocal
         db = SessionLocal()
         try:
             r = db.query(SQLConversation).filter(SQLConversation.id == conversation_id).first()
@@ -444,7 +600,6 @@ class ChatService:
     ) -> Conversation:
         """Update a conversation's title/status/metadata."""
         from ..models.sql_models import Conversation as SQLConversation
-        from ..db.base import SessionLocal
         db = SessionLocal()
         try:
             obj = db.query(SQLConversation).filter(SQLConversation.id == conversation_id).first()
@@ -470,7 +625,7 @@ class ChatService:
                     return out
                 current = _deep_merge(current, metadata)
                 obj.metadata_json = current
-            obj.updated_at = datetime.now(timezone.utc)
+            obj.updated_at = datetime.now(_UTC)
             db.add(obj)
             db.commit()
             db.refresh(obj)
@@ -494,7 +649,6 @@ class ChatService:
     async def delete_conversation(self, conversation_id: str) -> None:
         """Delete a conversation by ID (cascade deletes messages)."""
         from ..models.sql_models import Conversation as SQLConversation
-        from ..db.base import SessionLocal
         db = SessionLocal()
         try:
             obj = db.query(SQLConversation).filter(SQLConversation.id == conversation_id).first()
@@ -508,7 +662,6 @@ class ChatService:
     async def get_conversation_history(self, conversation_id: str, skip: int = 0, limit: int = 100) -> tuple[list[Message], int]:
         """Return messages for a conversation with pagination and total count."""
         from ..models.sql_models import Message as SQLMessage, Conversation as SQLConversation
-        from ..db.base import SessionLocal
         db = SessionLocal()
         try:
             total = db.query(SQLMessage).filter(SQLMessage.conversation_id == conversation_id).count()
@@ -605,7 +758,6 @@ class ChatService:
             turns_seen = 0
             try:
                 from ..models.sql_models import Conversation as SQLConversation
-                from ..db.base import SessionLocal
                 db_meta = SessionLocal()
                 try:
                     conv_row = db_meta.query(SQLConversation).filter(SQLConversation.id == conversation_id).first()
@@ -632,6 +784,10 @@ class ChatService:
             except Exception:
                 pass
 
+            # Fallback observability; only set when the orchestrator path raises
+            orch_failed_reason: Optional[str] = None
+            orch_planner_retries = 0
+
             # Orchestrator path (feature-flagged). If it raises or disabled, we continue legacy flow.
             try:
                 if getattr(settings, "ORCHESTRATION_ENABLED", False):
@@ -812,6 +968,23 @@ class ChatService:
                 orch_failed_reason = "plan_validation_failed" if "plan_validation_failed" in str(_orch_e) else "orchestrator_failed"
                 orch_planner_retries = 1 if orch_failed_reason == "plan_validation_failed" else 0
 
+            # Lowercase the user message once; every legacy-path heuristic below reuses it
+            lower_msg = (message or "").lower()
+            # Prayer consent "yes" phrasing; every pattern mentions "pray", so gate on that first
+            _consent_detected = "pray" in lower_msg and bool(_CONSENT_YES_UNION.search(lower_msg))
+
+            # Legacy-path state defaults; the gating blocks below overwrite these when they succeed
+            conversation_phase = "intake"
+            advice_intent = False
+            intake_completed_meta = False
+            safety_hit = False
+            allow_book_insertion = False
+            gate_reason: Optional[str] = None
+            cls_topic: Optional[str] = None
+            cls_conf = 0.0
+            advice_matches: List[str] = []
+            safety_terms_matched: List[str] = []
+
             # Ephemeral parsing of current user message for marriage facts (used for this turn's prompt only)
             # These will also be persisted later when updating conversation metadata.
             try:
@@ -820,47 +993,16 @@ class ChatService:
                 ephemeral_children_count: Optional[int] = None
                 ephemeral_prior_counseling: Optional[bool] = None
 
-                lm_ep = (message or "").lower()
+                lm_ep = lower_msg
 
-                # Years married patterns (e.g., "married 10 years", "for 3 yrs", "been married 1 year")
-                years_patterns = [
-                    r"\bmarried\s+(?:for\s+)?(\d{1,2})\s*(?:years|yrs|yr|year)s?\b",
-                    r"\b(\d{1,2})\s*(?:years|yrs|yr|year)s?\s+(?:of\s+)?marriage\b",
-                    r"\bfor\s+(\d{1,2})\s*(?:years|yrs|yr|year)s?\b.*\bmarried\b",
-                ]
-                for pat in years_patterns:
-                    m = re.search(pat, lm_ep)
-                    if m:
-                        try:
-                            ephemeral_years = int(m.group(1))
-                            break
-                        except Exception:
-                            pass
-                # Months (treat <1 year as 0 years for stage mapping)
-                if ephemeral_years is None:
-                    m_month = re.search(r"\bmarried\s+(?:for\s+)?(\d{1,2})\s*(?:months|mos|mo)\b", lm_ep)
-                    if m_month:
-                        ephemeral_years = 0
+                # Years married (months-only answers map to 0 years for stage mapping)
+                ephemeral_years = parse_marriage_years(lm_ep)
 
                 # Children detection
-                if re.search(r"\bno\s+(kids|children)\b|\bwithout\s+(kids|children)\b|\bno children yet\b", lm_ep):
-                    ephemeral_have_children = False
-                    ephemeral_children_count = 0
-                else:
-                    m_kids = re.search(r"\b(\d{1,2})\s*(kids|children)\b", lm_ep)
-                    if m_kids:
-                        try:
-                            ephemeral_children_count = int(m_kids.group(1))
-                            ephemeral_have_children = True
-                        except Exception:
-                            pass
-                    elif re.search(r"\b(kids|children)\b|\bexpecting\b|\bpregnant\b", lm_ep):
-                        ephemeral_have_children = True
+                ephemeral_have_children, ephemeral_children_count = parse_children(lm_ep)
 
                 # Prior counseling detection
-                if re.search(r"\b(counseling|counselling|counselor|counsellor|therapy|therapist)\b", lm_ep):
-                    neg = re.search(r"\b(never|no|haven't|havent|didn't|didnt|not)\b.{0,12}\b(counsel|therapy|counseling)\b", lm_ep)
-                    ephemeral_prior_counseling = False if neg else True
+                ephemeral_prior_counseling = parse_prior_counseling(lm_ep)
 
                 # Prefer existing metadata when present, otherwise use ephemeral for prompt conditioning
                 meta_years = None
@@ -958,8 +1100,6 @@ class ChatService:
                     )
                 })
 
-            # Normalize user content early for downstream heuristics
-            lower_msg = (message or "").lower()
             # Book attribution tracking (populated when topic rules inject book cues)
             book_pretty_list: List[str] = []
             book_pretty_to_cue: Dict[str, str] = {}
@@ -1337,7 +1477,7 @@ class ChatService:
                                 "phase": conversation_phase,
                                 "advice_intent": bool(advice_intent),
                                 "intake_complete": bool(intake_completed_meta),
-                                "topic_conf": cls_conf if 'cls_conf' in locals() else None,
+                                "topic_conf": cls_conf,
                             },
                         )
                     except Exception:
@@ -1416,7 +1556,7 @@ class ChatService:
                     # If scrubbing occurred under gating, append a neutral explainer line
                     try:
                         if (not allow_book_insertion) and _scrubbed_now:
-                            if assistant_message and not assistant_message.endswith(('.', '!', '?', '\n')):
+                            if assistant_message and assistant_message[-1] not in _SENTENCE_END_OR_NL:
                                 assistant_message += "\n"
                             assistant_message += "Once we’ve finished intake and I’m confident on the topic, I can suggest resources."
                     except Exception:
@@ -1502,7 +1642,7 @@ class ChatService:
                                 else:
                                     insertion = f" From {chosen_pretty}, one helpful idea is: {cue_text}."
                                 assistant_message = (assistant_message or "").strip()
-                                if assistant_message and not assistant_message.endswith(('.', '!', '?')):
+                                if assistant_message and assistant_message[-1] not in _SENTENCE_END:
                                     assistant_message += "."
                                 assistant_message = assistant_message + insertion
                                 # Record attribution metadata and reason
@@ -1540,7 +1680,7 @@ class ChatService:
                                 )
                             except Exception:
                                 pass
-                if assistant_message and not assistant_message.endswith(('.', '!', '?')):
+                if assistant_message and assistant_message[-1] not in _SENTENCE_END:
                     assistant_message += "."
                 # rotate generic pastoral prompts to avoid repetition (no Jesus mention here)
                 _variants = [
@@ -1571,7 +1711,7 @@ class ChatService:
                     # Tidy whitespace
                     assistant_message = re.sub(r"[ \t]{2,}", " ", (assistant_message or "")).strip()
                     # Ensure the neutral explainer is present
-                    if assistant_message and not assistant_message.endswith(('.', '!', '?', '\n')):
+                    if assistant_message and assistant_message[-1] not in _SENTENCE_END_OR_NL:
                         assistant_message += "\n"
                     assistant_message += "Once we’ve finished intake and I’m confident on the topic, I can suggest resources."
                     try:
@@ -1597,7 +1737,7 @@ class ChatService:
                         "(3) whether there are any safety concerns right now? If that’s already covered, just say “that’s enough” and I’ll move to advice."
                     )
                     assistant_message = (assistant_message or "").strip()
-                    if assistant_message and not assistant_message.endswith(('.', '!', '?', '\n')):
+                    if assistant_message and assistant_message[-1] not in _SENTENCE_END_OR_NL:
                         assistant_message += "\n"
                     assistant_message += wrapup
                     asked_question = True
@@ -1616,17 +1756,31 @@ class ChatService:
             jesus_invite_added = False
             decline_detected = False
             ignore_detected = False
+            # Conversation metadata needed for canonical gate (read below)
+            djut_val = None
+            last_invite_turn = None
+            jesus_decline_count = 0
+            consent_known = False
+            consent_val = False
+            from ..models.sql_models import Conversation as SQLConversation
+            from ..models.sql_models import Message as SQLMessage
+            turns_ok = False
             try:
                 # DB-derived assistant/user counts and last assistant content
                 assistant_turn_index, _user_turns_ign, last_assistant_text_for_jesus = self._get_turn_indexes(conversation_id)
+                turns_ok = True
+            except Exception:
+                assistant_turn_index = 0
+                last_turn_had_jesus = False
+            # One session serves both cadence reads: last assistant invite flag and conversation metadata
+            db_ro = None
+            try:
+                db_ro = SessionLocal()
                 # Prefer DB metadata flag from last assistant message over regex
-                try:
-                    from ..models.sql_models import Message as SQLMessage
-                    from ..db.base import SessionLocal
-                    _dbtmp = SessionLocal()
+                if turns_ok:
                     try:
                         last_a = (
-                            _dbtmp.query(SQLMessage)
+                            db_ro.query(SQLMessage)
                             .filter(SQLMessage.conversation_id == conversation_id, SQLMessage.role == "assistant")
                             .order_by(SQLMessage.created_at.desc())
                             .first()
@@ -1637,37 +1791,12 @@ class ChatService:
                                 last_turn_had_jesus = bool(_md.get("had_jesus_invite"))
                             else:
                                 # Fallback to regex detection if metadata was missing on older messages
-                                invite_patterns_legacy = [
-                                    r"where do you sense jesus inviting",
-                                    r"would you like to bring this to jesus",
-                                    r"pray with jesus",
-                                    r"bring this to (him|jesus)",
-                                ]
-                                last_turn_had_jesus = any(
-                                    re.search(p, last_assistant_text_for_jesus or "", re.I) for p in invite_patterns_legacy
-                                )
-                    finally:
-                        _dbtmp.close()
-                except Exception:
-                    # Conservative fallback
-                    last_turn_had_jesus = False
-            except Exception:
-                assistant_turn_index = 0
-                last_turn_had_jesus = False
-
-            # Read conversation metadata needed for canonical gate
-            djut_val = None
-            last_invite_turn = None
-            jesus_decline_count = 0
-            consent_known = False
-            consent_val = False
-            try:
-                # Fresh DB read for conversation metadata
-                from ..models.sql_models import Conversation as SQLConversation
-                from ..db.base import SessionLocal
-                db_tmp = SessionLocal()
+                                last_turn_had_jesus = bool(_INVITE_UNION.search(last_assistant_text_for_jesus or ""))
+                    except Exception:
+                        # Conservative fallback
+                        last_turn_had_jesus = False
                 try:
-                    conv_row = db_tmp.query(SQLConversation).filter(SQLConversation.id == conversation_id).first()
+                    conv_row = db_ro.query(SQLConversation).filter(SQLConversation.id == conversation_id).first()
                     if conv_row:
                         _meta_ro = getattr(conv_row, "metadata_json", None) or {}
                         # Cooldown
@@ -1683,10 +1812,7 @@ class ChatService:
                         elif isinstance(liv, str) and liv.isdigit():
                             last_invite_turn = int(liv)
                         # Decline counter
-                        try:
-                            jesus_decline_count = int(_meta_ro.get("jesus_decline_count", 0))
-                        except Exception:
-                            jesus_decline_count = 0
+                        jesus_decline_count = _meta_int(_meta_ro.get("jesus_decline_count"))
                         # Prayer consent
                         consent_known = bool(_meta_ro.get("prayer_consent_known", False))
                         consent_val = bool(_meta_ro.get("prayer_consent", False))
@@ -1698,34 +1824,29 @@ class ChatService:
                                     consent_known = bool(intake_meta.get("prayer_consent_known", False))
                             except Exception:
                                 pass
-                finally:
-                    db_tmp.close()
-                    try:
-                        # Ensure scoped_session does not retain stale identity map across requests
-                        SessionLocal.remove()  # type: ignore[misc]
-                    except Exception:
-                        pass
+                except Exception:
+                    djut_val = djut_val if isinstance(djut_val, int) else None
             except Exception:
+                # Session unavailable: conservative cadence defaults
+                last_turn_had_jesus = False
                 djut_val = djut_val if isinstance(djut_val, int) else None
+            finally:
+                if db_ro is not None:
+                    db_ro.close()
+                try:
+                    # Ensure scoped_session does not retain stale identity map across requests
+                    SessionLocal.remove()  # type: ignore[misc]
+                except Exception:
+                    pass
 
             # Detect prayer consent change from current user message
             try:
-                lm_curr = (message or "").lower()
-                consent_yes = [
-                    r"\bplease\s+pray\b",
-                    r"\bpray\s+for\s+me\b",
-                    r"\byes\b.*\bforward\b.*\bprayer\b",
-                    r"\byou\s+can\s+forward\b.*\bprayer\b",
-                ]
-                consent_no = [
-                    r"\bno\s+prayer\b",
-                    r"\bdo\s+not\s+pray\b|don't\s+pray",
-                    r"\bplease\s+don't\s+pray\b",
-                ]
-                if any(re.search(p, lm_curr, re.I) for p in consent_yes):
+                lm_curr = lower_msg
+                # Every consent pattern mentions "pray"; skip the regex work when it is absent
+                if _consent_detected:
                     consent_known = True
                     consent_val = True
-                elif any(re.search(p, lm_curr, re.I) for p in consent_no):
+                elif "pray" in lm_curr and _CONSENT_NO_UNION.search(lm_curr):
                     consent_known = True
                     consent_val = False
             except Exception:
@@ -1735,37 +1856,19 @@ class ChatService:
             declined_until_local = djut_val if isinstance(djut_val, int) else None
             try:
                 if last_turn_had_jesus:
-                    decline_patterns = [
-                        r"\bno\b",
-                        r"\bno thanks\b",
-                        r"\bnot (?:now|really|interested|comfortable)\b",
-                        r"\brather not\b",
-                        r"\bdon't want\b|\bdo not want\b",
-                        r"\bstop\b",
-                        r"\bplease don't\b|\bplease do not\b",
-                    ]
-                    accept_patterns = [
-                        r"\byes\b",
-                        r"\bok\b|\bokay\b|\bsure\b",
-                        r"\blet's\b|\blets\b",
-                        r"\bi will\b|\bi'll\b",
-                    ]
                     try:
-                        decline_detected = any(re.search(p, lm_curr, re.I) for p in decline_patterns)
-                        accepted = any(re.search(p, lm_curr, re.I) for p in accept_patterns)
+                        decline_detected = bool(_DECLINE_UNION.search(lm_curr))
+                        accepted = bool(_ACCEPT_UNION.search(lm_curr))
                         if accepted:
                             jesus_decline_count = 0
                         elif not decline_detected:
-                            if not re.search(r"\bjesus\b", lm_curr, re.I):
+                            if not _mentions_jesus(lm_curr):
                                 ignore_detected = True
                     except Exception:
                         decline_detected = False
                         ignore_detected = False
                     if decline_detected or ignore_detected:
-                        try:
-                            jesus_decline_count = int(jesus_decline_count) + 1
-                        except Exception:
-                            jesus_decline_count = 1
+                        jesus_decline_count = _meta_int(jesus_decline_count) + 1
                         if jesus_decline_count >= 2:
                             # Suppress invites for next 6 assistant turns (exclusive)
                             suggested_until = int(assistant_turn_index) + 6
@@ -1776,15 +1879,15 @@ class ChatService:
 
             # Canonical invite gate
             try:
-                _phase = locals().get("conversation_phase", None) or conversation_phase
+                _phase = conversation_phase
             except Exception:
                 _phase = "intake"
             try:
                 allow_jesus_invite, cadence_reason = invite_gate(
                     phase=_phase,
-                    advice_intent=bool(locals().get("advice_intent", False) or advice_intent),
-                    intake_completed=bool(locals().get("intake_completed_meta", False) or intake_completed_meta),
-                    safety_flag=bool(locals().get("safety_hit", False)),
+                    advice_intent=bool(advice_intent),
+                    intake_completed=bool(intake_completed_meta),
+                    safety_flag=bool(safety_hit),
                     assistant_turn_index=int(assistant_turn_index),
                     last_jesus_invite_turn=last_invite_turn if isinstance(last_invite_turn, int) else None,
                     declined_jesus_until_turn=declined_until_local,
@@ -1798,161 +1901,121 @@ class ChatService:
 
             # Append invite only when allowed
             if (not rooted_in_jesus_emphasis) and allow_jesus_invite:
-                if assistant_message and not assistant_message.endswith(('.', '!', '?')):
+                if assistant_message and assistant_message[-1] not in _SENTENCE_END:
                     assistant_message += "."
-                _variants2 = [
-                    " Where do you sense Jesus inviting you to take one small, grace-filled step this week?",
-                    " What might Jesus be leading you to try as a small next step right now?",
-                    " How could you bring this to Jesus in a practical way this week?",
-                ]
-                _idx2 = (assistant_turn_index + 1) % len(_variants2)
-                if _variants2[_idx2] not in assistant_message:
-                    assistant_message += _variants2[_idx2]
+                _idx2 = (assistant_turn_index + 1) % 3
+                # Every variant names Jesus, so rooted_in_jesus_emphasis being False already rules out a duplicate
+                assistant_message += _JESUS_INVITE_VARIANTS[_idx2]
                 rooted_in_jesus_emphasis = True
                 jesus_invite_variant_val = _idx2
                 jesus_invite_added = True
 
             try:
-                logger.info(
-                    "gate",
-                    extra={
-                        "cid": conversation_id,
-                        "path": "legacy",
-                        "phase": locals().get("conversation_phase", None),
-                        "advice_intent": bool(locals().get("advice_intent", False)),
-                        "intake_completed": bool(locals().get("intake_completed_meta", False)),
-                        "safety": bool(locals().get("safety_hit", False)),
-                        "consent_known": bool(locals().get("consent_known", False)),
-                        "consent": bool(locals().get("consent_val", False)),
-                        "a_idx": int(assistant_turn_index),
-                        "last_invite": last_invite_turn if isinstance(last_invite_turn, int) else None,
-                        "until": declined_until_local,
-                        "allow_jesus": bool(allow_jesus_invite),
-                        "cadence_reason": cadence_reason,
-                        "allow_books": bool(locals().get("allow_book_insertion", False)),
-                        "gate_reason": locals().get("gate_reason", None),
-                    },
-                )
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        "gate",
+                        extra={
+                            "cid": conversation_id,
+                            "path": "legacy",
+                            "phase": conversation_phase,
+                            "advice_intent": bool(advice_intent),
+                            "intake_completed": bool(intake_completed_meta),
+                            "safety": bool(safety_hit),
+                            "consent_known": bool(consent_known),
+                            "consent": bool(consent_val),
+                            "a_idx": int(assistant_turn_index),
+                            "last_invite": last_invite_turn if isinstance(last_invite_turn, int) else None,
+                            "until": declined_until_local,
+                            "allow_jesus": bool(allow_jesus_invite),
+                            "cadence_reason": cadence_reason,
+                            "allow_books": bool(allow_book_insertion),
+                            "gate_reason": gate_reason,
+                        },
+                    )
             except Exception:
                 pass
 
             # Derive intake confirmation for THIS TURN (deterministic flip on explicit affirmation)
             # This is computed before building per-message metadata so the assistant message includes nested intake.completed
             try:
-                # Use the raw message to avoid any upstream alterations and lowercase it here
-                lm_now = ((message or "")).lower()
-                confirm_patterns_now = [
-                    r"\bthat's enough\b(?:[.,!]|$)",
-                    r"\bthats enough\b(?:[.,!]|$)",
-                    r"\bwe'?re good\b(?:[.,!]|$)",
-                    r"\bready for advice\b",
-                    r"\bi'?m ready for advice\b",
-                    r"\bi am ready for advice\b",
-                    r"\bdone with intake\b",
-                    r"\bmove to advice\b",
-                    r"\bgo ahead\b",
-                ]
-                wrap_confirm_now = any(re.search(p, lm_now, re.I) for p in confirm_patterns_now)
+                lm_now = lower_msg
+                wrap_confirm_now = bool(_WRAP_CONFIRM_UNION.search(lm_now))
             except Exception:
                 wrap_confirm_now = False
             try:
-                # Simple substring fallback (defensive) to avoid any regex edge-cases
-                if not wrap_confirm_now:
-                    if (
-                        ("that's enough" in lm_now)
-                        or ("thats enough" in lm_now)
-                        or ("ready for advice" in lm_now)
-                        or ("i'm ready for advice" in lm_now)
-                        or ("i am ready for advice" in lm_now)
-                        or ("we're good" in lm_now)
-                        or ("we are good" in lm_now)
-                        or ("done with intake" in lm_now)
-                        or ("move to advice" in lm_now)
-                        or ("go ahead" in lm_now)
-                    ):
-                        wrap_confirm_now = True
-                logger.warning(
-                    "wrap_confirm_now",
-                    extra={
-                        "cid": conversation_id,
-                        "path": "legacy",
-                        "msg": lm_now,
-                        "wrap": bool(wrap_confirm_now),
-                        "msg_length": len(lm_now),
-                        "contains_thats_enough": "that's enough" in lm_now,
-                        "contains_ready_for_advice": "ready for advice" in lm_now,
-                    },
-                )
+                if logger.isEnabledFor(logging.WARNING):
+                    logger.warning(
+                        "wrap_confirm_now",
+                        extra={
+                            "cid": conversation_id,
+                            "path": "legacy",
+                            "msg": lm_now,
+                            "wrap": bool(wrap_confirm_now),
+                            "msg_length": len(lm_now),
+                            "contains_thats_enough": "that's enough" in lm_now,
+                            "contains_ready_for_advice": "ready for advice" in lm_now,
+                        },
+                    )
             except Exception:
                 pass
             # Build an intake snapshot for message metadata
             try:
-                greetings_now = ["hello", "hi", "hey", "good morning", "good afternoon", "good evening"]
-                issue_named_now = bool(len(lm_now.strip()) > 12 and not any(g in lm_now for g in greetings_now))
+                issue_named_now = bool(len(lm_now.strip()) > 12 and not _GREETING_UNION.search(lm_now))
             except Exception:
                 issue_named_now = False
             try:
-                intake_completed_now = bool(locals().get("intake_completed_meta", False) or wrap_confirm_now)
+                intake_completed_now = bool(intake_completed_meta or wrap_confirm_now)
                 # When wrap-up is confirmed, force all intake flags to True for completion
                 if wrap_confirm_now:
-                    intake_meta_for_msg = {
-                        "issue_named": True,
-                        "safety_cleared": True,
-                        "goal_captured": True,
-                        "prayer_consent_known": True,
-                        "completed": True,
-                    }
+                    intake_meta_for_msg = dict(_INTAKE_ALL_TRUE)
                     intake_completed_now = True
                 else:
                     intake_meta_for_msg = {
                         "issue_named": bool(issue_named_now),
-                        "safety_cleared": bool(not locals().get("safety_hit", False)),
-                        "goal_captured": bool(locals().get("advice_intent", False)),
-                        "prayer_consent_known": bool(locals().get("consent_known", False)),
+                        "safety_cleared": bool(not safety_hit),
+                        "goal_captured": bool(advice_intent),
+                        "prayer_consent_known": bool(consent_known),
                         "completed": bool(intake_completed_now),
                     }
             except Exception:
-                intake_meta_for_msg = {"completed": bool(locals().get("intake_completed_meta", False) or wrap_confirm_now)}
+                intake_meta_for_msg = {"completed": bool(intake_completed_meta or wrap_confirm_now)}
                 intake_completed_now = bool(intake_meta_for_msg.get("completed", False))
-            # Defensive: if wrap confirmation detected but completed flag not set due to logic above, set it now
-            if wrap_confirm_now and not bool(intake_meta_for_msg.get("completed", False)):
-                intake_meta_for_msg["completed"] = True
-                intake_completed_now = True
             try:
-                logger.warning(
-                    "intake_meta_for_msg",
-                    extra={
-                        "cid": conversation_id,
-                        "path": "legacy",
-                        "intake": intake_meta_for_msg,
-                    },
-                )
+                if logger.isEnabledFor(logging.WARNING):
+                    logger.warning(
+                        "intake_meta_for_msg",
+                        extra={
+                            "cid": conversation_id,
+                            "path": "legacy",
+                            "intake": intake_meta_for_msg,
+                        },
+                    )
             except Exception:
                 pass
             # Adjust allow_books and gate_reason for this message based on derived intake snapshot
             try:
                 allow_books_msg = bool(
-                    locals().get("advice_intent", False)
+                    advice_intent
                     and bool(intake_completed_now)
-                    and (not bool(locals().get("safety_hit", False)))
-                    and (float(locals().get("cls_conf", 0.0)) >= 0.6)
+                    and (not bool(safety_hit))
+                    and (float(cls_conf) >= 0.6)
                 )
                 if allow_books_msg:
                     gate_reason_msg = "ok"
                 else:
-                    if locals().get("safety_hit", False):
+                    if safety_hit:
                         gate_reason_msg = "safety_triage"
                     elif not intake_completed_now:
                         gate_reason_msg = "intake_incomplete"
-                    elif float(locals().get("cls_conf", 0.0)) < 0.6:
+                    elif float(cls_conf) < 0.6:
                         gate_reason_msg = "low_confidence"
                     else:
                         gate_reason_msg = "ok"
             except Exception:
-                allow_books_msg = bool(locals().get("allow_book_insertion", False))
-                gate_reason_msg = locals().get("gate_reason", None)
+                allow_books_msg = bool(allow_book_insertion)
+                gate_reason_msg = gate_reason
 
-            # Build canonical metadata and normalize for observability
+            # Build canonical metadata; add_message normalizes it just before the insert
             _legacy_meta = {
                 "model": self.model,
                 "style_guide": "friend_v1",
@@ -1969,33 +2032,28 @@ class ChatService:
                 "jesus_invite_variant": jesus_invite_variant_val,
                 # Orchestration fallback + path
                 "path": "legacy",
-                "fallback_reason": locals().get("orch_failed_reason", None),
-                "planner_retries": locals().get("orch_planner_retries", 0),
+                "fallback_reason": orch_failed_reason,
+                "planner_retries": orch_planner_retries,
                 "allow_books": allow_books_msg,
                 "allow_jesus": allow_jesus_invite,
                 "cadence_reason": cadence_reason,
                 # Per-message flag to mirror orchestrator for DB-derived history
-                "had_jesus_invite": bool(jesus_invite_added),
+                "had_jesus_invite": jesus_invite_added,
                 # Topic classifier signals
-                "topic": locals().get("cls_topic", None),
-                "topic_confidence": locals().get("cls_conf", 0.0),
+                "topic": cls_topic,
+                "topic_confidence": cls_conf,
                 # Additional diagnostic fields retained (non-canonical)
                 "identity_emphasis": identity_emphasis,
                 "book_cues": book_pretty_list,
                 "used_book_attribution": (book_attributions[0] if book_attributions else None),
                 "book_priority_applied": book_priority_applied,
-                "advice_patterns_matched": locals().get("advice_matches", []),
-                "safety_terms_matched": locals().get("safety_terms_matched", []),
+                "advice_patterns_matched": advice_matches,
+                "safety_terms_matched": safety_terms_matched,
                 "intake_completed_meta": intake_completed_now,
                 "allow_book_insertion": allow_books_msg,
                 # Deterministic intake snapshot for this turn
                 "intake": intake_meta_for_msg,
             }
-            try:
-                _legacy_meta = normalize_meta(_legacy_meta)
-            except Exception:
-                pass
-
             assistant_msg = await self.add_message(
                 conversation_id=conversation_id,
                 user_id="assistant",  # Or use a system user ID
@@ -2003,203 +2061,106 @@ class ChatService:
                 role=MessageRole.ASSISTANT,
                 message_type=MessageType.TEXT,
                 metadata=_legacy_meta,
+                normalize=True,
             )
             try:
-                used_book_attr = (book_attributions[0] if book_attributions else "")
-                logger.info(
-                    "generation_ok cid=%s len=%d asked_q=%s faith_branch=%s identity_emphasis=%s book_cues=%s used_book_attr=%s",
-                    conversation_id,
-                    len(assistant_message or ""),
-                    asked_question,
-                    faith_branch,
-                    identity_emphasis,
-                    ", ".join(book_pretty_list) if book_pretty_list else "",
-                    used_book_attr,
-                )
+                if logger.isEnabledFor(logging.INFO):
+                    used_book_attr = (book_attributions[0] if book_attributions else "")
+                    logger.info(
+                        "generation_ok cid=%s len=%d asked_q=%s faith_branch=%s identity_emphasis=%s book_cues=%s used_book_attr=%s",
+                        conversation_id,
+                        len(assistant_message or ""),
+                        asked_question,
+                        faith_branch,
+                        identity_emphasis,
+                        ", ".join(book_pretty_list) if book_pretty_list else "",
+                        used_book_attr,
+                    )
             except Exception:
                 pass
             # Update conversation metadata/state
+            wrap_confirm = False
             try:
                 from ..models.sql_models import Conversation as SQLConversation
-                from ..db.base import SessionLocal
                 from ..policies.intake import IntakeState
                 db = SessionLocal()
                 try:
                     conv = db.query(SQLConversation).filter(SQLConversation.id == conversation_id).first()
                     if conv:
                         meta = getattr(conv, "metadata_json", None) or {}
-                        old_meta = dict(meta)
+                        # Only the meta_diff keys are compared later; snapshot those instead of copying all of meta
+                        old_snap = {k: meta.get(k) for k in _META_DIFF_KEYS}
                         # Increment turns
-                        meta["turns"] = int(meta.get("turns", 0)) + 1
+                        meta["turns"] = _meta_int(meta.get("turns")) + 1
                         # Record last_jesus_invite_turn if we appended an invite this turn
-                        if locals().get("jesus_invite_added", False):
-                            try:
-                                # Use DB-derived assistant turn index to match orchestrator semantics
-                                meta["last_jesus_invite_turn"] = int(locals().get("assistant_turn_index", 0))
-                            except Exception:
-                                pass
+                        if jesus_invite_added:
+                            # Use DB-derived assistant turn index to match orchestrator semantics
+                            meta["last_jesus_invite_turn"] = int(assistant_turn_index)
                         # Persist consent state if known
-                        try:
-                            if bool(locals().get("consent_known", False)):
-                                meta["prayer_consent_known"] = True
-                                meta["prayer_consent"] = bool(locals().get("consent_val", False))
-                                # Also reflect in intake nested state if present
-                                if isinstance(meta.get("intake"), dict):
-                                    meta["intake"]["prayer_consent_known"] = True
-                        except Exception:
-                            pass
+                        if consent_known:
+                            meta["prayer_consent_known"] = True
+                            meta["prayer_consent"] = bool(consent_val)
+                            # Also reflect in intake nested state if present
+                            if isinstance(meta.get("intake"), dict):
+                                meta["intake"]["prayer_consent_known"] = True
                         # Lowercased user message for heuristics
-                        lm = (message or "").lower()
-                        try:
-                            # Marriage
-                            years_val: Optional[int] = None
-                            for pat in [
-                                r"\bmarried\s+(?:for\s+)?(\d{1,2})\s*(?:years|yrs|yr|year)s?\b",
-                                r"\b(\d{1,2})\s*(?:years|yrs|yr|year)s?\s+(?:of\s+)?marriage\b",
-                                r"\bfor\s+(\d{1,2})\s*(?:years|yrs|yr|year)s?\b.*\bmarried\b",
-                            ]:
-                                m = re.search(pat, lm)
-                                if m:
-                                    try:
-                                        years_val = int(m.group(1))
-                                        break
-                                    except Exception:
-                                        pass
-                            if years_val is None:
-                                if re.search(r"\bmarried\s+(?:for\s+)?(\d{1,2})\s*(?:months|mos|mo)\b", lm):
-                                    years_val = 0
-                            if years_val is not None:
-                                meta["marriage_years"] = years_val
-                                # Stage mapping
-                                if years_val <= 2:
-                                    meta["marriage_stage"] = "newly_married"
-                                elif years_val <= 10:
-                                    meta["marriage_stage"] = "mid"
-                                else:
-                                    meta["marriage_stage"] = "long_term"
-
-                            # Children
-                            if re.search(r"\bno\s+(kids|children)\b|\bwithout\s+(kids|children)\b|\bno children yet\b", lm):
-                                meta["have_children"] = False
-                                meta["children_count"] = 0
-                            else:
-                                m_k = re.search(r"\b(\d{1,2})\s*(kids|children)\b", lm)
-                                if m_k:
-                                    try:
-                                        meta["children_count"] = int(m_k.group(1))
-                                        meta["have_children"] = True
-                                    except Exception:
-                                        pass
-                                elif re.search(r"\b(kids|children)\b|\bexpecting\b|\bpregnant\b", lm):
-                                    meta["have_children"] = True
-
-                            # Prior counseling
-                            if re.search(r"\b(counseling|counselling|counselor|counsellor|therapy|therapist)\b", lm):
-                                neg = re.search(r"\b(never|no|haven't|havent|didn't|didnt|not)\b.{0,12}\b(counsel|therapy|counseling)\b", lm)
-                                meta["prior_counseling"] = False if neg else True
-                        except Exception:
-                            pass
-                        consent_patterns = [
-                            r"\bplease\s+pray\b",
-                            r"\bpray\s+for\s+me\b",
-                            r"\byes\b.*\bforward\b.*\bprayer\b",
-                            r"\byou\s+can\s+forward\b.*\bprayer\b",
-                        ]
-                        if any(re.search(p, lm) for p in consent_patterns):
-                            meta["consent_for_prayer"] = True
-                        else:
-                            meta["consent_for_prayer"] = bool(meta.get("consent_for_prayer", False))
-                        # Detect last_intent from user message
-                        intent = None
-                        if any(k in lm for k in ["porn", "pornography", "lust", "accountability", "filter", "filters"]):
-                            intent = "sexual_integrity"
-                        elif any(k in lm for k in ["divorce", "separation", "separated"]):
-                            intent = "divorce_or_separation"
-                        elif any(k in lm for k in ["trust", "betrayal", "affair", "adultery"]):
-                            intent = "rebuilding_trust"
-                        elif any(k in lm for k in ["argue", "conflict", "fight", "communication"]):
-                            intent = "communication_conflict"
-                        elif any(k in lm for k in ["pray", "prayer"]):
-                            intent = "prayer_support"
-                        elif any(k in lm for k in ["hello", "hi", "hey", "good morning", "good afternoon", "good evening"]):
-                            intent = "greeting"
-                        if intent:
-                            meta["last_intent"] = intent
-                        # Faith-aware metadata
-                        if getattr(settings, "PASTORAL_FAITH_BRANCHING", True):
-                            # infer faith_status from user/assistant content
-                            # User message signals
-                            if re.search(r"\b(i am|i'm)\s+(a\s+)?(christian|believer|follower of jesus)\b", lm):
-                                meta["faith_status"] = "christian"
-                            elif re.search(r"\b(i am|i'm)\s+(not\s+)?(christian|religious)\b", lm) or re.search(r"\b(agnostic|atheist)\b", lm):
-                                meta["faith_status"] = "not_christian"
-                            elif re.search(r"\b(i am|i'm)\s+(just\s+)?exploring( faith)?\b", lm) or "exploring faith" in lm:
-                                meta["faith_status"] = "exploring"
-                            # Assistant faith question detection (to avoid repeat)
-                            if re.search(r"are you (a )?follower of jesus|are you christian|are you a christian|exploring faith", assistant_message, re.I):
-                                meta["asked_faith_question"] = True
-                            # Local church detection
-                            if re.search(r"\b(church|small group|community group|pastor)\b", lm):
-                                neg = re.search(r"\b(no(t)?|don'?t|without|haven't|not in a)\b", lm)
-                                meta["has_local_church"] = False if neg else True
+                        lm = lower_msg
+                        update_meta_after_turn(
+                            meta,
+                            lm,
+                            assistant_message,
+                            consent_detected=_consent_detected,
+                            faith_branching=getattr(settings, "PASTORAL_FAITH_BRANCHING", True),
+                        )
                         # Identity encouragement counter
                         if getattr(self.settings, "IDENTITY_IN_CHRIST_PRIORITY", True):
                             if identity_emphasis:
-                                try:
-                                    meta["identity_encouragement_count"] = int(meta.get("identity_encouragement_count", 0)) + 1
-                                except Exception:
-                                    meta["identity_encouragement_count"] = 1
+                                meta["identity_encouragement_count"] = _meta_int(meta.get("identity_encouragement_count")) + 1
                         # Conversation phase and gating counters
                         try:
                             # Phase from this turn
-                            meta["conversation_phase"] = locals().get("conversation_phase", meta.get("conversation_phase", "intake"))
+                            meta["conversation_phase"] = conversation_phase
                             # Advice request counter (user intent)
-                            if locals().get("advice_intent", False):
-                                meta["advice_request_count"] = int(meta.get("advice_request_count", 0)) + 1
+                            if advice_intent:
+                                meta["advice_request_count"] = _meta_int(meta.get("advice_request_count")) + 1
                             # Persist intake completion deterministically when affirmed this turn
                             try:
                                 # Check for wrap-up confirmation from early detection
-                                wrap_detected = bool(locals().get("wrap_confirm_now", False))
-                                intake_complete = bool(locals().get("intake_completed_now", False))
+                                wrap_detected = bool(wrap_confirm_now)
+                                intake_complete = bool(intake_completed_now)
                                 
                                 if wrap_detected or intake_complete:
                                     meta["intake_completed"] = True
                                     if not isinstance(meta.get("intake"), dict):
                                         meta["intake"] = {}
                                     # Force ALL intake flags to True for definitive completion
-                                    meta["intake"]["completed"] = True
-                                    meta["intake"]["issue_named"] = True
-                                    meta["intake"]["safety_cleared"] = True
-                                    meta["intake"]["goal_captured"] = True
-                                    meta["intake"]["prayer_consent_known"] = True  # Critical for IntakeState.is_complete()
+                                    meta["intake"].update(_INTAKE_ALL_TRUE)
                                     try:
-                                        logger.info(
-                                            "intake_persist",
-                                            extra={
-                                                "cid": conversation_id,
-                                                "path": "legacy",
-                                                "completed": True,
-                                                "affirmed": wrap_detected,
-                                                "wrap_confirm_now": wrap_detected,
-                                                "intake_completed_now": intake_complete,
-                                                "final_intake_meta": meta.get("intake", {}),
-                                            },
-                                        )
+                                        if logger.isEnabledFor(logging.INFO):
+                                            logger.info(
+                                                "intake_persist",
+                                                extra={
+                                                    "cid": conversation_id,
+                                                    "path": "legacy",
+                                                    "completed": True,
+                                                    "affirmed": wrap_detected,
+                                                    "wrap_confirm_now": wrap_detected,
+                                                    "intake_completed_now": intake_complete,
+                                                    "final_intake_meta": meta.get("intake", {}),
+                                                },
+                                            )
                                     except Exception:
                                         pass
                             except Exception:
                                 pass
                             # Book attribution counter (assistant usage)
-                            if locals().get("book_attributions"):
-                                try:
-                                    meta["book_attribution_count"] = int(meta.get("book_attribution_count", 0)) + len(locals().get("book_attributions") or [])
-                                except Exception:
-                                    meta["book_attribution_count"] = int(meta.get("book_attribution_count", 0)) + 1
+                            if book_attributions:
+                                meta["book_attribution_count"] = _meta_int(meta.get("book_attribution_count")) + len(book_attributions)
                             # Last used book and gating snapshot
-                            if locals().get("allow_book_insertion", False):
-                                meta["last_used_book"] = (locals().get("book_attributions") or [None])[0]
-                            meta["allow_book_insertion_last"] = bool(locals().get("allow_book_insertion", False))
-                            meta["safety_flag_last"] = bool(locals().get("safety_hit", False))
+                            if allow_book_insertion:
+                                meta["last_used_book"] = (book_attributions or [None])[0]
+                            meta["allow_book_insertion_last"] = bool(allow_book_insertion)
+                            meta["safety_flag_last"] = bool(safety_hit)
                             # Persist decline counters/cooldown in legacy path using DB-derived detection
                             try:
                                 # Compute from DB for this conversation
@@ -2207,56 +2168,46 @@ class ChatService:
                                 a_turns = 0
                                 last_a_txt = ""
                                 try:
-                                    rows2 = (
-                                        db.query(SQLMessage)
-                                        .filter(SQLMessage.conversation_id == conversation_id)
-                                        .order_by(SQLMessage.created_at.asc())
-                                        .all()
+                                    # Aggregate in SQL (served by ix_messages_conv_role_created) instead of
+                                    # hydrating the whole conversation history every turn
+                                    a_turns = int(
+                                        db.query(func.count(SQLMessage.id))
+                                        .filter(
+                                            SQLMessage.conversation_id == conversation_id,
+                                            SQLMessage.role == "assistant",
+                                        )
+                                        .scalar()
+                                        or 0
                                     )
-                                    for r2 in rows2:
-                                        if r2.role == "assistant":
-                                            a_turns += 1
-                                            last_a_txt = r2.content or last_a_txt
+                                    last_a_row = (
+                                        db.query(SQLMessage.content)
+                                        .filter(
+                                            SQLMessage.conversation_id == conversation_id,
+                                            SQLMessage.role == "assistant",
+                                            SQLMessage.content != "",
+                                        )
+                                        .order_by(SQLMessage.created_at.desc())
+                                        .first()
+                                    )
+                                    if last_a_row is not None:
+                                        last_a_txt = last_a_row[0] or ""
                                 except Exception:
                                     pass
-                                invite_patterns = [
-                                    r"where do you sense jesus inviting",
-                                    r"would you like to bring this to jesus",
-                                    r"pray with jesus",
-                                    r"bring this to (him|jesus)",
-                                ]
-                                last_turn_had_jesus_l = any(re.search(p, last_a_txt or "", re.I) for p in invite_patterns)
-                                lm_curr_l = (message or "").lower()
-                                decline_patterns_l = [
-                                    r"\bno\b",
-                                    r"\bno thanks\b",
-                                    r"\bnot (?:now|really|interested|comfortable)\b",
-                                    r"\brather not\b",
-                                    r"\bdon't want\b|\bdo not want\b",
-                                    r"\bstop\b",
-                                    r"\bplease don't\b|\bplease do not\b",
-                                ]
-                                accept_patterns_l = [
-                                    r"\byes\b",
-                                    r"\bok\b|\bokay\b|\bsure\b",
-                                    r"\blet's\b|\blets\b",
-                                    r"\bi will\b|\bi'll\b",
-                                ]
-                                try:
-                                    decline_detected_l = any(re.search(p, lm_curr_l, re.I) for p in decline_patterns_l)
-                                    accepted_l = any(re.search(p, lm_curr_l, re.I) for p in accept_patterns_l)
-                                except Exception:
-                                    decline_detected_l = False
-                                    accepted_l = False
+                                last_a_l = (last_a_txt or "").lower()
+                                # Every invite pattern names Jesus except "bring this to him"; skip the regex otherwise
+                                last_turn_had_jesus_l = bool(
+                                    ("jesus" in last_a_l or "bring this to him" in last_a_l)
+                                    and _INVITE_UNION.search(last_a_l)
+                                )
+                                lm_curr_l = lower_msg
+                                decline_detected_l = bool(_DECLINE_UNION.search(lm_curr_l))
+                                accepted_l = bool(_ACCEPT_UNION.search(lm_curr_l))
                                 ignore_detected_l = False
                                 if last_turn_had_jesus_l and not decline_detected_l and not accepted_l:
-                                    if not re.search(r"\bjesus\b", lm_curr_l, re.I):
+                                    if not _mentions_jesus(lm_curr_l):
                                         ignore_detected_l = True
                                 # Load existing counters
-                                try:
-                                    jdc = int(meta.get("jesus_decline_count", 0))
-                                except Exception:
-                                    jdc = 0
+                                jdc = _meta_int(meta.get("jesus_decline_count"))
                                 djut = meta.get("declined_jesus_until_turn")
                                 if accepted_l:
                                     jdc = 0
@@ -2273,136 +2224,74 @@ class ChatService:
                                 pass
                         except Exception:
                             pass
-                        # Detect last scripture used from assistant message
-                        am = assistant_message
-                        scripture_match = re.search(r"\b(?:[1-3]\s*)?[A-Za-z]+\s+\d+:\d+(?:-\d+)?\b", am)
-                        if scripture_match:
-                            meta["last_scripture_used"] = scripture_match.group(0)
-                        # Heuristic trust rebuild stage
-                        am_l = am.lower()
-                        if any(k in am_l for k in ["transparency", "weekly actions", "accountability"]):
-                            meta["trust_rebuild_stage"] = "early_repair"
                         # Intake checklist: derive and persist completion using IntakeState
                         try:
-                            intake_state = IntakeState.from_meta(meta)
-                            # Check if wrap-up was confirmed this turn
-                            wrap_confirmed_this_turn = bool(locals().get("wrap_confirm_now", False))
-                            
-                            if wrap_confirmed_this_turn:
-                                # Force all intake flags to True when wrap-up is confirmed
-                                intake_state.issue_named = True
-                                intake_state.safety_cleared = True
-                                intake_state.goal_captured = True
-                                intake_state.prayer_consent_known = True
+                            # Update the nested intake flags in place (no IntakeState from_meta/to_meta round-trip);
+                            # like IntakeState.from_meta, fall back to flat flags on meta when there is no nested dict
+                            intake = meta.get("intake")
+                            if not isinstance(intake, dict):
+                                intake = {k: meta.get(k, False) for k in _INTAKE_FLAGS}
+                                meta["intake"] = intake
+                            for k in _INTAKE_FLAGS:
+                                intake[k] = bool(intake.get(k, False))
+                            # Explicit intake wrap-up confirmation (user says we're good to proceed);
+                            # the earlier per-message detection already searched this same message
+                            wrap_confirm = wrap_confirm_now
+                            if wrap_confirm:
+                                # Force all intake flags to True when wrap-up is confirmed; this also
+                                # treats the confirmation as implicit consent for faith guidance
+                                intake.update(_INTAKE_ALL_TRUE)
+                                try:
+                                    logger.info("intake_confirm", extra={"cid": conversation_id, "path": "legacy"})
+                                except Exception:
+                                    pass
                             else:
                                 # Update fields based on this turn
-                                intake_state.prayer_consent_known = bool(locals().get("consent_known", False) or meta.get("prayer_consent_known", False))
+                                intake["prayer_consent_known"] = bool(consent_known or meta.get("prayer_consent_known", False))
                                 # Consider issue named if user shared non-trivial content not just greeting
-                                greetings = ["hello", "hi", "hey", "good morning", "good afternoon", "good evening"]
-                                intake_state.issue_named = bool(intake_state.issue_named or (len(lm.strip()) > 12 and not any(g in lm for g in greetings)))
+                                intake["issue_named"] = intake["issue_named"] or (len(lm.strip()) > 12 and not _GREETING_UNION.search(lm))
                                 # Safety cleared when no safety flag this turn
-                                intake_state.safety_cleared = bool(intake_state.safety_cleared or not bool(locals().get("safety_hit", False)))
+                                intake["safety_cleared"] = intake["safety_cleared"] or not bool(safety_hit)
                                 # Goal captured if advice intent detected
-                                intake_state.goal_captured = bool(intake_state.goal_captured or bool(locals().get("advice_intent", False)))
-                            # Explicit intake wrap-up confirmation (user says we're good to proceed)
-                            try:
-                                lm_l = (lm or "").lower()
-                                confirm_patterns = [
-                                    r"\bthat's enough\b",
-                                    r"\bthats enough\b",
-                                    r"\bwe'?re good\b",
-                                    r"\bready for advice\b",
-                                    r"\bdone with intake\b",
-                                    r"\bmove to advice\b",
-                                    r"\bgo ahead\b",
-                                ]
-                                wrap_confirm = any(re.search(p, lm_l, re.I) for p in confirm_patterns)
-                                # Always use the earlier per-message detection as the authoritative source
-                                try:
-                                    wrap_confirm = bool(locals().get("wrap_confirm_now", False))
-                                    # Additional patterns for robustness at conversation level
-                                    if not wrap_confirm:
-                                        if (
-                                            ("that's enough" in lm_l)
-                                            or ("thats enough" in lm_l)
-                                            or ("ready for advice" in lm_l)
-                                            or ("i'm ready for advice" in lm_l)
-                                            or ("i am ready for advice" in lm_l)
-                                            or ("done with intake" in lm_l)
-                                            or ("move to advice" in lm_l)
-                                            or ("go ahead" in lm_l)
-                                        ):
-                                            wrap_confirm = True
-                                except Exception:
-                                    pass
-                            except Exception:
-                                wrap_confirm = False
+                                intake["goal_captured"] = intake["goal_captured"] or bool(advice_intent)
                             # Heuristic fallback across recent context when not explicitly confirmed
-                            goal_any = bool(locals().get("advice_intent", False))
+                            goal_any = bool(advice_intent)
                             partner_any = False
                             timeframe_any = False
-                            try:
-                                # Look at last up to 6 turns of history (user-focused) for signals
-                                recent_hist = self._get_history_for_model(conversation_id, max_turns=6)
-                                goal_pats = [
-                                    r"\bmy goal is\b",
-                                    r"\bi (?:want|hope|need) to\b",
-                                    r"\bwe (?:want|hope|need) to\b",
-                                    r"\bnext steps?\b",
-                                ]
-                                partner_pats = [
-                                    r"\bhusband\b", r"\bwife\b", r"\bspouse\b", r"\bpartner\b",
-                                    r"\bgirlfriend\b", r"\bboyfriend\b",
-                                ]
-                                timeframe_pats = [
-                                    r"\bthis week\b", r"\bnext (?:few\s+)?weeks\b", r"\bby (?:friday|monday|\d{1,2}/\d{1,2})\b",
-                                    r"\bwithin (?:a|one)?\s*(?:month|weeks?)\b", r"\bsoon\b",
-                                ]
-                                for m in (recent_hist or []):
-                                    try:
-                                        if (m or {}).get("role") != "user":
-                                            continue
-                                        txt = ((m or {}).get("content") or "").lower()
-                                        if not goal_any and any(re.search(p, txt, re.I) for p in goal_pats):
-                                            goal_any = True
-                                        if not partner_any and any(re.search(p, txt, re.I) for p in partner_pats):
-                                            partner_any = True
-                                        if not timeframe_any and any(re.search(p, txt, re.I) for p in timeframe_pats):
-                                            timeframe_any = True
-                                    except Exception:
-                                        continue
-                            except Exception:
-                                pass
+                            # The signals only feed the heuristic below; skip the history read and scans when
+                            # wrap-up is confirmed or the checklist is already complete
+                            heuristic_needed = not wrap_confirm and not IntakeState(**intake).is_complete()
+                            if heuristic_needed:
+                                try:
+                                    # Look at last up to 6 turns of history (user-focused) for signals
+                                    recent_hist = self._get_history_for_model(conversation_id, max_turns=6)
+                                    # One search per signal over all recent user turns; the NUL separator is neither
+                                    # whitespace nor a word char, so no pattern can match across two turns
+                                    joined = "\x00".join(
+                                        ((m or {}).get("content") or "").lower()
+                                        for m in (recent_hist or [])
+                                        if (m or {}).get("role") == "user"
+                                    )
+                                    goal_any = goal_any or bool(_GOAL_UNION.search(joined))
+                                    partner_any = bool(_PARTNER_UNION.search(joined))
+                                    timeframe_any = bool(_TIMEFRAME_UNION.search(joined))
+                                except Exception:
+                                    pass
                             # Determine assistant turns seen from DB-derived index (canonical)
-                            try:
-                                turns_seen = int(locals().get("assistant_turn_index", 0))
-                            except Exception:
-                                turns_seen = 0
+                            turns_seen = int(assistant_turn_index)
                             # Apply heuristic completion when appropriate and not already complete/confirmed
-                            try:
-                                cls_conf_loc = float(locals().get("cls_conf", 0.0))
-                            except Exception:
-                                cls_conf_loc = 0.0
-                            if not wrap_confirm and not intake_state.is_complete():
+                            cls_conf_loc = float(cls_conf)
+                            if heuristic_needed:
                                 heuristic_ok = (
                                     (cls_conf_loc >= 0.6 and goal_any and (partner_any or timeframe_any))
-                                    or (turns_seen >= 5 and bool(locals().get("advice_intent", False)) and cls_conf_loc >= 0.7)
+                                    or (turns_seen >= 5 and bool(advice_intent) and cls_conf_loc >= 0.7)
                                 )
                                 if heuristic_ok:
-                                    intake_state.issue_named = True
-                                    intake_state.safety_cleared = True
-                                    intake_state.goal_captured = True
-                            if wrap_confirm:
-                                intake_state.issue_named = True
-                                intake_state.safety_cleared = True
-                                intake_state.goal_captured = True
-                                # When user explicitly confirms wrap-up, treat as implicit consent for faith guidance
-                                intake_state.prayer_consent_known = True
-                                # prayer_consent_known remains as captured; do not force without consent
-                                try:
-                                    logger.info("intake_confirm", extra={"cid": conversation_id, "path": "legacy"})
-                                except Exception:
-                                    pass
+                                    intake["issue_named"] = True
+                                    intake["safety_cleared"] = True
+                                    intake["goal_captured"] = True
+                            # Flags are settled from here on; evaluate completion once
+                            state_complete = IntakeState(**intake).is_complete()
                             # Log intake state snapshot for observability
                             try:
                                 logger.info(
@@ -2410,8 +2299,8 @@ class ChatService:
                                     extra={
                                         "cid": conversation_id,
                                         "path": "legacy",
-                                        "complete": bool(intake_state.is_complete()),
-                                        "turns_seen": int(locals().get("assistant_turn_index", 0)),
+                                        "complete": state_complete,
+                                        "turns_seen": int(assistant_turn_index),
                                         "goal": bool(goal_any),
                                         "partner": bool(partner_any),
                                         "timeframe": bool(timeframe_any),
@@ -2420,146 +2309,71 @@ class ChatService:
                                 )
                             except Exception:
                                 pass
-                            # Merge back to meta
-                            _intake_meta = intake_state.to_meta()
-                            meta.setdefault("intake", {})
-                            meta["intake"].update(_intake_meta.get("intake", {}))
-                            meta["intake_completed"] = bool(intake_state.is_complete())
+                            intake["completed"] = state_complete
+                            meta["intake_completed"] = state_complete
                             
                             # Debug log before any overrides
-                            logger.warning(
-                                "pre_override_intake_state",
-                                extra={
-                                    "cid": conversation_id,
-                                    "path": "legacy", 
-                                    "intake_state_complete": intake_state.is_complete(),
-                                    "intake_state_flags": {
-                                        "issue_named": intake_state.issue_named,
-                                        "safety_cleared": intake_state.safety_cleared,
-                                        "goal_captured": intake_state.goal_captured,
-                                        "prayer_consent_known": intake_state.prayer_consent_known,
+                            if logger.isEnabledFor(logging.DEBUG):
+                                logger.debug(
+                                    "pre_override_intake_state",
+                                    extra={
+                                        "cid": conversation_id,
+                                        "path": "legacy",
+                                        "intake_state_complete": state_complete,
+                                        "intake_state_flags": {k: intake[k] for k in _INTAKE_FLAGS},
+                                        "meta_intake": meta.get("intake", {}),
+                                        "meta_intake_completed": meta.get("intake_completed"),
                                     },
-                                    "meta_intake": meta.get("intake", {}),
-                                    "meta_intake_completed": meta.get("intake_completed"),
-                                },
-                            )
-                            
+                                )
+
                             # Deterministic override: if the user explicitly affirmed wrap-up this turn,
                             # persist completion regardless of prayer_consent_known state.
                             if wrap_confirm:
                                 try:
-                                    meta["intake"]["completed"] = True
-                                    meta["intake_completed"] = True
                                     # Force all intake flags in meta to True
-                                    meta["intake"]["issue_named"] = True
-                                    meta["intake"]["safety_cleared"] = True
-                                    meta["intake"]["goal_captured"] = True
-                                    meta["intake"]["prayer_consent_known"] = True
-                                    
-                                    logger.warning(
-                                        "intake_override_complete",
-                                        extra={
-                                            "cid": conversation_id,
-                                            "path": "legacy",
-                                            "wrap_confirm": True,
-                                            "meta_intake_after_override": meta.get("intake", {}),
-                                            "meta_intake_completed_after_override": meta.get("intake_completed"),
-                                        },
-                                    )
+                                    intake.update(_INTAKE_ALL_TRUE)
+                                    meta["intake_completed"] = True
+                                    if logger.isEnabledFor(logging.DEBUG):
+                                        logger.debug(
+                                            "intake_override_complete",
+                                            extra={
+                                                "cid": conversation_id,
+                                                "path": "legacy",
+                                                "wrap_confirm": True,
+                                                "meta_intake_after_override": meta.get("intake", {}),
+                                                "meta_intake_completed_after_override": meta.get("intake_completed"),
+                                            },
+                                        )
                                 except Exception:
                                     pass
                         except Exception:
                             # Fallback to previous flag if present
                             meta["intake_completed"] = bool(meta.get("intake_completed", False))
                         # Persist cadence snapshot for frontend badges
-                        try:
-                            meta["cadence_reason"] = cadence_reason
-                            meta["allow_jesus_last"] = bool(locals().get("allow_jesus_invite", False))
-                            meta["allow_books_last"] = bool(locals().get("allow_book_insertion", False))
-                        except Exception:
-                            pass
+                        meta["cadence_reason"] = cadence_reason
+                        meta["allow_jesus_last"] = bool(allow_jesus_invite)
+                        meta["allow_books_last"] = bool(allow_book_insertion)
                         # Log meta diff summary
                         try:
-                            interesting_keys = [
-                                "declined_jesus_until_turn",
-                                "jesus_decline_count",
-                                "last_jesus_invite_turn",
-                                "prayer_consent_known",
-                                "prayer_consent",
-                                "intake_completed",
-                                "conversation_phase",
-                                "allow_book_insertion_last",
-                                "safety_flag_last",
-                                "cadence_reason",
-                                "allow_jesus_last",
-                                "allow_books_last",
-                            ]
                             changes = {}
-                            for k in interesting_keys:
-                                if old_meta.get(k) != meta.get(k):
-                                    changes[k] = {"old": old_meta.get(k), "new": meta.get(k)}
+                            for k, old_v in old_snap.items():
+                                new_v = meta.get(k)
+                                if old_v != new_v:
+                                    changes[k] = {"old": old_v, "new": new_v}
                             logger.info("meta_diff", extra={"cid": conversation_id, "path": "legacy", "changes": changes})
                         except Exception:
                             pass
-                        # Assign a fresh dict so SQLAlchemy detects JSON changes without MutableDict
-                        conv.metadata_json = dict(meta)
+                        # meta was mutated in place; flag_modified marks the JSON column dirty without copying the dict
+                        conv.metadata_json = meta
                         try:
                             flag_modified(conv, "metadata_json")
                         except Exception:
                             pass
-                        conv.updated_at = datetime.now(timezone.utc)
+                        conv.updated_at = datetime.now(_UTC)
                         db.add(conv)
-                        # Ensure changes are flushed before commit for reliability
-                        try:
-                            db.flush()
-                        except Exception:
-                            pass
                         db.commit()
-                        # Verification step: in a fresh session, ensure intake completion persisted
-                        try:
-                            # Only verify when we detected completion/confirmation this turn
-                            if bool(locals().get("wrap_confirm_now", False)) or bool(locals().get("intake_completed_now", False)) or bool(locals().get("wrap_confirm", False)):
-                                vdb = SessionLocal()
-                                try:
-                                    vrow = (
-                                        vdb.query(SQLConversation)
-                                        .filter(SQLConversation.id == conversation_id)
-                                        .first()
-                                    )
-                                    if vrow:
-                                        vmeta = getattr(vrow, "metadata_json", None) or {}
-                                        vintake = vmeta.get("intake") if isinstance(vmeta, dict) else {}
-                                        completed_persisted = bool(isinstance(vintake, dict) and vintake.get("completed"))
-                                        if not completed_persisted:
-                                            vmeta.setdefault("intake", {})
-                                            vmeta["intake"].update(
-                                                {
-                                                    "completed": True,
-                                                    "issue_named": True,
-                                                    "safety_cleared": True,
-                                                    "goal_captured": True,
-                                                    "prayer_consent_known": True,
-                                                }
-                                            )
-                                            # Assign a fresh dict to trigger change detection
-                                            vrow.metadata_json = dict(vmeta)
-                                            try:
-                                                flag_modified(vrow, "metadata_json")
-                                            except Exception:
-                                                pass
-                                            vdb.add(vrow)
-                                            vdb.commit()
-                                finally:
-                                    vdb.close()
-                        except Exception:
-                            # Non-fatal: API metadata will still reflect completion; DB verification failed
-                            pass
                 finally:
                     db.close()
-                    try:
-                        SessionLocal.remove()  # type: ignore[misc]
-                    except Exception:
-                        pass
                     try:
                         # Ensure scoped_session does not retain stale identity map across requests
                         SessionLocal.remove()  # type: ignore[name-defined]
@@ -2580,8 +2394,8 @@ class ChatService:
                 try:
                     completed_canonical = bool(
                         completed_canonical
-                        or bool(locals().get("wrap_confirm_now", False))
-                        or bool(locals().get("wrap_confirm", False))
+                        or bool(wrap_confirm_now)
+                        or bool(wrap_confirm)
                     )
                 except Exception:
                     pass
@@ -2594,15 +2408,7 @@ class ChatService:
                     if isinstance(meta_intake, dict):
                         am_meta["intake"].update(meta_intake)
                     # Deterministically set completion flags on the message metadata
-                    am_meta["intake"].update(
-                        {
-                            "completed": True,
-                            "issue_named": True,
-                            "safety_cleared": True,
-                            "goal_captured": True,
-                            "prayer_consent_known": True,
-                        }
-                    )
+                    am_meta["intake"].update(_INTAKE_ALL_TRUE)
                     # Clear intake gating on the message metadata if present
                     if am_meta.get("gate_reason") == "intake_incomplete":
                         am_meta["gate_reason"] = "ok"
@@ -0,0 +1 @@
+# Utility helpers (env/key loading)
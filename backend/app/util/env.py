@@ -0,0 +1,25 @@
+import functools
+import mmap
+
+
+@functools.lru_cache(maxsize=8)
+def load_env_key(name: str, path: str = ".env") -> str:
+    """Value of `name` from a dotenv-style file, parsed once per process; "" if absent or unreadable.
+
+    The file is memory-mapped and searched with bytes.find (memchr-backed) rather than walked line by line.
+    """
+    needle = name.encode("utf-8") + b"="
+    try:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # First occurrence at the start of a line
+            i = 0 if mm[: len(needle)] == needle else mm.find(b"\n" + needle)
+            if i == -1:
+                return ""
+            if i:
+                i += 1
+            start = i + len(needle)
+            end = mm.find(b"\n", start)
+            return mm[start : end if end != -1 else len(mm)].decode("utf-8", errors="ignore").strip()
+    except (OSError, ValueError):
+        # ValueError: an empty file cannot be mapped
+        return ""
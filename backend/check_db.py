@@ -2,6 +2,8 @@
 import sqlite3
 from pathlib import Path
 
+MAX_COMPOUND_SELECT = 500
+
 
 def main():
     """Main function to check database schema."""
@@ -18,48 +20,57 @@ def main():
         conn = sqlite3.connect(str(db_path))
         cursor = conn.cursor()
 
-        # List all tables
+        # Tables and their columns in one round-trip (table-valued pragma, SQLite 3.16+)
         cursor.execute(
             """
-            SELECT name FROM sqlite_master
-            WHERE type='table'
-            AND name NOT LIKE 'sqlite_%';
+            SELECT m.name, p.name, p.type, p."notnull", p.pk
+            FROM sqlite_master AS m
+            JOIN pragma_table_info(m.name) AS p
+            WHERE m.type='table'
+            AND m.name NOT LIKE 'sqlite_%'
+            ORDER BY m.rowid, p.cid;
         """
         )
 
-        tables = cursor.fetchall()
+        columns_by_table = {}
+        for table_name, name, col_type, notnull, pk in cursor.fetchall():
+            columns_by_table.setdefault(table_name, []).append((name, col_type, notnull, pk))
 
-        if not tables:
+        if not columns_by_table:
             print("No tables found in the database.")
             return
 
+        # Row counts in one UNION ALL query per group of tables; groups stay within SQLite's
+        # limit on compound SELECT terms (SQLITE_MAX_COMPOUND_SELECT, 500 by default)
+        table_names = list(columns_by_table)
+        counts = {}
+        for start in range(0, len(table_names), MAX_COMPOUND_SELECT):
+            group = table_names[start : start + MAX_COMPOUND_SELECT]
+            cursor.execute(
+                " UNION ALL ".join(f"SELECT ?, COUNT(*) FROM \"{table_name}\"" for table_name in group),
+                group,
+            )
+            counts.update(cursor.fetchall())
+
         print("\nTables in the database:")
         print("-" * 40)
-        for table in tables:
-            table_name = table[0]
+        for table_name, columns in columns_by_table.items():
             print(f"\nTable: {table_name}")
             print("-" * (len(table_name) + 7))
 
-            # Get table info
-            cursor.execute(f"PRAGMA table_info({table_name});")
-            columns = cursor.fetchall()
-
             print("Columns:")
-            for col in columns:
-                col_id, name, col_type, notnull, default_val, pk = col
+            for name, col_type, notnull, pk in columns:
                 print(
                     f"  {name}: {col_type} {'PRIMARY KEY' if pk else ''} {'NOT NULL' if notnull else ''}"
                 )
 
-            # Count rows
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name};")
-            count = cursor.fetchone()[0]
+            count = counts[table_name]
             print(f"\n  Rows: {count}")
 
             # Show sample data if any
             if count > 0:
                 print("\n  Sample data:")
-                cursor.execute(f"SELECT * FROM {table_name} LIMIT 3;")
+                cursor.execute(f"SELECT * FROM \"{table_name}\" LIMIT 3;")
                 rows = cursor.fetchall()
                 for row in rows:
                     print(f"  {row}")
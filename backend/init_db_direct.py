@@ -2,15 +2,12 @@
 Direct database initialization script.
 Run this script to create and initialize the SQLite database.
 """
-import sys
 from pathlib import Path
 
 
 def main():
     # Add the backend directory to the Python path
-    backend_path = str(Path(__file__).parent.absolute())
-    if backend_path not in sys.path:
-        sys.path.insert(0, backend_path)
+    import _pathsetup  # noqa: F401
 
     # Create instance directory if it doesn't exist
     instance_path = Path("instance")
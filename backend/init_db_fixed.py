@@ -2,15 +2,12 @@
 Fixed database initialization script.
 This script ensures all models are imported and tables are created.
 """
-import sys
 from pathlib import Path
 
 
 def main():
     # Add the backend directory to the Python path
-    backend_path = str(Path(__file__).parent.absolute())
-    if backend_path not in sys.path:
-        sys.path.insert(0, backend_path)
+    import _pathsetup  # noqa: F401
 
     # Create instance directory if it doesn't exist
     instance_path = Path("instance")
@@ -24,18 +21,27 @@ def main():
 
     print("Creating database tables...")
     try:
-        # Create all tables
-        Base.metadata.create_all(bind=engine)
+        is_sqlite = engine.dialect.name == "sqlite"
+        # Create all tables on one connection/transaction (WAL + synchronous=NORMAL come from the
+        # engine's connect hook in app.db.base, so DDL commits skip the per-statement fsync)
+        with engine.begin() as conn:
+            if is_sqlite:
+                conn.exec_driver_sql("PRAGMA temp_store=MEMORY")
+            Base.metadata.create_all(bind=conn)
         print("Successfully created database tables!")
 
         # Verify tables were created
         from sqlalchemy import inspect
 
-        inspector = inspect(engine)
-        tables = inspector.get_table_names()
+        # One multi-table reflection pass (SQLAlchemy 2.0) instead of a query per table
+        with engine.connect() as conn:
+            columns_by_table = inspect(conn).get_multi_columns()
+            if is_sqlite:
+                # Refresh planner statistics now that the schema (and its indexes) exist
+                conn.exec_driver_sql("PRAGMA optimize")
         print("\nTables in the database:")
-        for table in tables:
-            print(f"- {table}")
+        for (_schema, table), columns in sorted(columns_by_table.items(), key=lambda kv: kv[0][1]):
+            print(f"- {table} ({len(columns)} columns)")
 
     except Exception as e:
         print(f"Error creating database tables: {e}")
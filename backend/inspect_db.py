@@ -16,6 +16,9 @@ def inspect_database(db_file):
     conn = sqlite3.connect(db_file)
     cursor = conn.cursor()
 
+    # Read everything under one transaction: a single shared lock and schema check instead of one per statement
+    cursor.execute("BEGIN")
+
     # Get list of tables
     cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
     tables = cursor.fetchall()
@@ -29,7 +32,9 @@ def inspect_database(db_file):
         print("=" * 80)
 
         # Get table schema
-        cursor.execute(f"PRAGMA table_info({table_name});")
+        # Table-valued pragma with a bound name: one statement text for every table, so SQLite's
+        # statement cache reuses the compiled plan instead of re-parsing per table
+        cursor.execute("SELECT * FROM pragma_table_info(?);", (table_name,))
         columns = cursor.fetchall()
         print("\nColumns:")
         for col in columns:
@@ -37,38 +42,46 @@ def inspect_database(db_file):
 
         # Get sample data (top 5 rows)
         try:
-            cursor.execute(f"SELECT * FROM {table_name} LIMIT 5;")
-            rows = cursor.fetchall()
-            if rows:
+            # Quoted identifier so unusual table names parse; rows are streamed off the cursor
+            cursor.execute(f'SELECT * FROM "{table_name}" LIMIT 5;')
+            first = cursor.fetchone()
+            if first is not None:
                 print("\nSample Data (up to 5 rows):")
-                for row in rows:
+                print(f"  {first}")
+                for row in cursor:
                     print(f"  {row}")
             else:
                 print("\nNo data in this table.")
         except sqlite3.Error as e:
             print(f"\nError accessing data: {e}")
 
-    # Close connection
+    # Close connection (ends the read transaction)
+    conn.rollback()
     conn.close()
 
 
 if __name__ == "__main__":
     print("\nSearching for database files...")
 
-    # Try multiple possible locations
-    possible_paths = [
-        "instance/shepherd.db",
-        "./instance/shepherd.db",
-        "./shepherd.db",
-        "app.db"
-    ]
+    # Candidate database files per directory, in search order; one scandir per directory
+    # instead of an exists() stat per candidate path
+    candidates = {
+        "instance": ("shepherd.db",),
+        ".": ("shepherd.db", "app.db"),
+    }
 
     found = False
-    for path in possible_paths:
-        if os.path.exists(path):
-            print(f"Found database at: {path}")
-            inspect_database(path)
-            found = True
+    for directory, names in candidates.items():
+        if not os.path.isdir(directory):
+            continue
+        with os.scandir(directory) as it:
+            present = {e.name: e.path for e in it if e.name in names and e.is_file()}
+        for name in names:
+            if name in present:
+                path = present[name]
+                print(f"Found database at: {path}")
+                inspect_database(path)
+                found = True
 
     if not found:
         print("No database files found in the checked locations.")
@@ -2,16 +2,52 @@
 """
 Initialize the SQLite database and create all tables.
 """
+import os
+import sqlite3
 import sys
 from pathlib import Path
 
 # Add the parent directory to the Python path
 sys.path.append(str(Path(__file__).parent.parent))
-from app.db.base import init_db  # noqa: E402
-from app.db.base import Base, engine  # noqa: E402
+
+
+def build_fresh_sqlite_in_memory() -> None:
+    """Build a brand-new SQLite database in memory and copy it to disk with one backup pass.
+
+    Runs before app.db.base is imported (its import creates tables on the file directly),
+    and never touches a database file that already exists.
+    """
+    from dotenv import load_dotenv
+    from sqlalchemy import create_engine
+    from sqlalchemy.engine import make_url
+
+    load_dotenv()
+    url = make_url(os.getenv("DATABASE_URL", "sqlite:///./shepherd.db"))
+    db_file = url.database if url.get_backend_name() == "sqlite" else None
+    if not db_file or db_file == ":memory:" or Path(db_file).exists():
+        return
+
+    from app.models.sql_models import Base as ModelsBase
+
+    mem_engine = create_engine("sqlite://")
+    ModelsBase.metadata.create_all(bind=mem_engine)
+    src = mem_engine.raw_connection()
+    dst = sqlite3.connect(db_file)
+    try:
+        src.driver_connection.backup(dst)
+    finally:
+        dst.close()
+        src.close()
+        mem_engine.dispose()
+
 
 if __name__ == "__main__":
     print("Initializing database...")
+    build_fresh_sqlite_in_memory()
+
+    from app.db.base import init_db  # noqa: E402
+    from app.db.base import Base, engine  # noqa: E402
+
     # Import all models to ensure they are registered with SQLAlchemy
     from app.models.sql_models import User, Conversation, Message, Prayer, UserProfile, BibleVerse  # noqa: F401
 
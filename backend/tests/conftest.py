@@ -1,4 +1,7 @@
+import os
+import shutil
 import sys
+import tempfile
 from pathlib import Path
 
 # Ensure repository root is on sys.path so 'import backend' works
@@ -6,9 +9,145 @@ ROOT = Path(__file__).resolve().parents[2]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+# Point the app at a throwaway SQLite file before anything imports backend.app.db.base (its engine is
+# bound at import time). Always override: `fresh_db` replaces this file, so it must never be a real DB.
+# Each pytest-xdist worker imports this module in its own process and so gets its own file.
+_WORKER = os.environ.get("PYTEST_XDIST_WORKER", "main")
+_TEST_DB_DIR = Path(tempfile.mkdtemp(prefix=f"shepherd-tests-{_WORKER}-"))
+os.environ["DATABASE_URL"] = f"sqlite:///{_TEST_DB_DIR / 'shepherd.db'}"
+
 # Force pytest-anyio to use asyncio backend (avoid requiring 'trio')
 import pytest
 
 @pytest.fixture
 def anyio_backend():
     return "asyncio"
+
+
+def _release_db() -> None:
+    from backend.app.db.base import SessionLocal, engine
+
+    SessionLocal.remove()
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def marriage_rules():
+    """Parsed app/pastoral/rules/marriage.json, from the same registry the app reads."""
+    from backend.app.pastoral.rules import get_rules
+
+    return get_rules("marriage")
+
+
+@pytest.fixture(scope="session")
+def valid_plan_template():
+    """A ResponsePlan that passes validate_response_plan, validated once per session."""
+    from backend.app.policies.response_plan import Plan, ResponsePlan, Safety, Step
+
+    steps = [
+        Step(title=title, how_to_say_it="Say this...", time_estimate_min=minutes, trigger_if_then="if A then B")
+        for title, minutes in (("Try X", 10), ("Try Y", 15), ("Try Z", 20))
+    ]
+    return ResponsePlan(
+        phase="advice",
+        safety=Safety(flag=False, reason=None),
+        topic="conflict",
+        intake_completed_needed=False,
+        jesus_invite_allowed=True,
+        jesus_invite_variant=1,
+        topic_confidence=0.8,
+        book_candidate_keys=["love_and_respect"],
+        plan=Plan(
+            mirror="I hear you...",
+            diagnose="You're facing...",
+            truth_anchor="Anchor that is sufficiently long.",
+            steps_7day=steps,
+            obstacles=["time", "motivation"],
+            check_in_question="How did it go?",
+        ),
+    )
+
+
+@pytest.fixture
+def plan_factory(valid_plan_template):
+    """Deep copy of the valid template with top-level fields overridden (no re-validation)."""
+
+    def make(**overrides):
+        return valid_plan_template.model_copy(update=overrides, deep=True)
+
+    return make
+
+
+@pytest.fixture(scope="session")
+def template_db(tmp_path_factory):
+    """Schema-only database built once per session; tests get copies of it via `fresh_db`."""
+    from backend.app.db.base import engine, init_db
+
+    db_path = Path(engine.url.database)
+    init_db()
+    _release_db()
+    template = tmp_path_factory.mktemp("db") / "template.db"
+    shutil.copyfile(db_path, template)
+    return template
+
+
+@pytest.fixture
+def fresh_db(template_db):
+    """Reset the app database to the empty template (a file copy, no DDL) and yield its path."""
+    from backend.app.db.base import engine
+
+    db_path = Path(engine.url.database)
+    _release_db()
+    for suffix in ("-wal", "-shm"):
+        Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+    shutil.copyfile(template_db, db_path)
+    yield db_path
+    _release_db()
+
+
+@pytest.fixture
+def db_session(fresh_db):
+    """Session on the per-test database, for tests that only need the DB (no ASGI client)."""
+    from backend.app.db.base import SessionLocal
+
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def close_log_handlers():
+    """Close root logging handlers added during the test to avoid unclosed file warnings."""
+    import logging
+
+    root_logger = logging.getLogger()
+    before = set(root_logger.handlers)
+    yield
+    for h in [h for h in root_logger.handlers if h not in before]:
+        try:
+            h.flush()
+            h.close()
+        except Exception:
+            pass
+        root_logger.removeHandler(h)
+
+
+@pytest.fixture(scope="session")
+def asgi_transport():
+    """One ASGI transport over the app for the whole session; it holds no per-test state.
+
+    Requests go straight into the app through this transport, so the AsyncClient built on it never
+    touches httpx's connection pool. (Starlette's TestClient at the pinned FastAPI version also
+    needs httpx<0.28, which requirements do not pin.)
+    """
+    from httpx import ASGITransport
+
+    from backend.app.main import app
+
+    return ASGITransport(app=app)
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(_TEST_DB_DIR, ignore_errors=True)
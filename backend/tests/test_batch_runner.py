@@ -0,0 +1,20 @@
+import json
+
+from backend.app.services.batch_runner import build_batch_jsonl, parse_batch_output
+
+
+def test_batch_jsonl_round_trip():
+    body = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "hi"}]}
+    lines = build_batch_jsonl([{"custom_id": "a", "body": body}]).splitlines()
+    assert json.loads(lines[0]) == {
+        "custom_id": "a",
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": body,
+    }
+
+    output = "\n".join([
+        json.dumps({"custom_id": "a", "response": {"status_code": 200, "body": {"choices": []}}, "error": None}),
+        json.dumps({"custom_id": "b", "response": None, "error": {"code": "bad"}}),
+    ])
+    assert parse_batch_output(output) == {"a": {"choices": []}, "b": {"error": {"code": "bad"}}}
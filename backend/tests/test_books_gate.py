@@ -1,5 +1,7 @@
+import copy
 import types
-from typing import Any, Dict, List
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List
 
 import pytest
 
@@ -36,24 +38,65 @@ def _dummy_plan(check_in: str, phase: str = "advice", conf: float = 0.5) -> Any:
     return plan
 
 
+# Built once; tests deep-copy it and set only the fields they vary
+_BASE_PLAN = _dummy_plan(check_in="")
+
+
+def _plan(check_in: str, conf: float) -> Any:
+    plan = copy.deepcopy(_BASE_PLAN)
+    plan.topic_confidence = conf
+    plan.plan.check_in_question = check_in
+    return plan
+
+
+def _returns(value: Any):
+    """Deterministic stub: ignores its arguments and hands back the same prebuilt object every call."""
+    return lambda *_args, **_kwargs: value
+
+
+# Stub results built once at import (graph only reads them)
+_CLS_LOW = {"topic": "marriage", "confidence": 0.2}
+_CLS_HIGH = {"topic": "marriage", "confidence": 0.85}
+_INSIGHTS_LOW = ["Seek to understand before being understood."]
+_INSIGHTS_HIGH = ["Name the pattern, not the person."]
+_SNIPPETS_UNUSED = [{"book_pretty": "ShouldNotAppear", "section": "1"}]
+_SNIPPETS = [
+    {"book_key": "k1", "book_pretty": "A Real Book", "author": "Jane Doe", "section": "ch1"},
+    {"book_key": "k2", "book_pretty": "Another Book", "author": "John Roe", "section": "ch3"},
+]
+
+
+def _fast_setattr(target: Any, name: str, value: Any, finalizers: Deque[Callable[[], None]]) -> None:
+    """Minimal monkeypatch.setattr: patch now, push the undo onto the front of `finalizers`."""
+    old = getattr(target, name)
+    setattr(target, name, value)
+    finalizers.appendleft(lambda: setattr(target, name, old))
+
+
 @pytest.fixture(autouse=True)
-def _isolate_defaults(monkeypatch):
+def _isolate_defaults():
     # Prevent external network/moderation variation
-    monkeypatch.setattr(graph_mod, "pre_moderate", lambda _: DummySafety(False))
-    monkeypatch.setattr(graph_mod, "post_moderate", lambda s: s)
-    yield
+    finalizers: Deque[Callable[[], None]] = deque()
+    try:
+        _fast_setattr(graph_mod, "pre_moderate", lambda _: DummySafety(False), finalizers)
+        _fast_setattr(graph_mod, "post_moderate", lambda s: s, finalizers)
+        yield
+    finally:
+        # Undo whatever was applied, even if a later patch raised
+        for undo in finalizers:
+            undo()
 
 
 def test_low_confidence_gates_and_scrubs(monkeypatch):
     # Plan and classifier both low to ensure conf_eff < 0.6
-    plan_obj = _dummy_plan(check_in='Have you tried reading "A Made Up Title" together?', conf=0.3)
+    plan_obj = _plan(check_in='Have you tried reading "A Made Up Title" together?', conf=0.3)
     monkeypatch.setattr(graph_mod, "llm_structured", lambda **kwargs: plan_obj)
-    monkeypatch.setattr(graph_mod, "validate_response_plan", lambda _p: (True, []))
-    monkeypatch.setattr(graph_mod, "classify", lambda _msg: {"topic": "marriage", "confidence": 0.2})
+    monkeypatch.setattr(graph_mod, "validate_response_plan", lambda _p: (True, ()))
+    monkeypatch.setattr(graph_mod, "classify", _returns(_CLS_LOW))
     # Insights should still be retrieved (title-free)
-    monkeypatch.setattr(graph_mod, "get_insight_clauses", lambda _t, limit=6: ["Seek to understand before being understood."])
+    monkeypatch.setattr(graph_mod, "get_insight_clauses", _returns(_INSIGHTS_LOW))
     # Retrieval must not be used when gated
-    monkeypatch.setattr(graph_mod, "retrieve_snippets", lambda _t: [{"book_pretty": "ShouldNotAppear", "section": "1"}])
+    monkeypatch.setattr(graph_mod, "retrieve_snippets", _returns(_SNIPPETS_UNUSED))
 
     st = graph_mod.TurnState(
         conversation_id="c-low",
@@ -79,21 +122,14 @@ def test_low_confidence_gates_and_scrubs(monkeypatch):
 
 
 def test_allows_books_when_confident(monkeypatch):
-    plan_obj = _dummy_plan(check_in="What feels hardest?", conf=0.9)
+    plan_obj = _plan(check_in="What feels hardest?", conf=0.9)
     monkeypatch.setattr(graph_mod, "llm_structured", lambda **kwargs: plan_obj)
-    monkeypatch.setattr(graph_mod, "validate_response_plan", lambda _p: (True, []))
-    monkeypatch.setattr(graph_mod, "classify", lambda _msg: {"topic": "marriage", "confidence": 0.85})
+    monkeypatch.setattr(graph_mod, "validate_response_plan", lambda _p: (True, ()))
+    monkeypatch.setattr(graph_mod, "classify", _returns(_CLS_HIGH))
     # Insights present regardless of gating
-    monkeypatch.setattr(graph_mod, "get_insight_clauses", lambda _t, limit=6: ["Name the pattern, not the person."])
+    monkeypatch.setattr(graph_mod, "get_insight_clauses", _returns(_INSIGHTS_HIGH))
     # Provide retrieval context so compose adds Sources
-    monkeypatch.setattr(
-        graph_mod,
-        "retrieve_snippets",
-        lambda _t: [
-            {"book_key": "k1", "book_pretty": "A Real Book", "author": "Jane Doe", "section": "ch1"},
-            {"book_key": "k2", "book_pretty": "Another Book", "author": "John Roe", "section": "ch3"},
-        ],
-    )
+    monkeypatch.setattr(graph_mod, "retrieve_snippets", _returns(_SNIPPETS))
 
     st = graph_mod.TurnState(
         conversation_id="c-high",
@@ -1,10 +1,12 @@
 import types
 
+import pytest
+
 from backend.app.orchestration.graph import Orchestrator, TurnState
 from backend.app.policies.response_plan import ResponsePlan, Plan, Safety, Step
 
 
-def _valid_plan(phase: str = "advice", jesus_allowed: bool = True) -> ResponsePlan:
+def _build_valid_plan(phase: str = "advice", jesus_allowed: bool = True) -> ResponsePlan:
     steps = [
         Step(title="Step 1", how_to_say_it="Say..", time_estimate_min=10, trigger_if_then="if A then B"),
         Step(title="Step 2", how_to_say_it="Say..", time_estimate_min=10, trigger_if_then="if A then B"),
@@ -30,6 +32,14 @@ def _valid_plan(phase: str = "advice", jesus_allowed: bool = True) -> ResponsePl
     )
 
 
+# Validated once at import; per-test variants are cheap copies rather than fresh model construction
+_BASE_PLAN = _build_valid_plan()
+
+
+def _valid_plan(phase: str = "advice", jesus_allowed: bool = True) -> ResponsePlan:
+    return _BASE_PLAN.model_copy(deep=True, update={"phase": phase, "jesus_invite_allowed": jesus_allowed})
+
+
 def _mk_state(**overrides):
     base = dict(
         conversation_id="c1",
@@ -46,60 +56,75 @@ def _mk_state(**overrides):
     return TurnState(**base)  # type: ignore[arg-type]
 
 
+@pytest.fixture(autouse=True, scope="module")
+def _graph_patches():
+    # Plan-independent stubs, installed once for the whole module
+    from backend.app.orchestration import graph as g
+
+    mp = pytest.MonkeyPatch()
+    mp.setattr(g, "pre_moderate", lambda text: types.SimpleNamespace(flag=False))
+    mp.setattr(g, "post_moderate", lambda text: text)
+    mp.setattr(g, "classify", lambda text: {"topic": _BASE_PLAN.topic, "confidence": _BASE_PLAN.topic_confidence})
+    mp.setattr(g, "retrieve_snippets", lambda topic: [])
+    mp.setattr(g, "triage_route", lambda text, safety: {"content": "triage", "metadata": {}})
+    yield
+    mp.undo()
+
+
+@pytest.fixture(scope="module")
+def orch() -> Orchestrator:
+    # Orchestrator keeps no per-run state, so one instance serves every test in the module
+    return Orchestrator()
+
+
 def _patch_dependencies(monkeypatch, plan: ResponsePlan):
-    # Always safe
+    # Structured LLM returns our injected plan (the only per-test patch)
     from backend.app.orchestration import graph as g
 
-    monkeypatch.setattr(g, "pre_moderate", lambda text: types.SimpleNamespace(flag=False))
-    monkeypatch.setattr(g, "post_moderate", lambda text: text)
-    monkeypatch.setattr(g, "classify", lambda text: {"topic": plan.topic, "confidence": plan.topic_confidence})
-    monkeypatch.setattr(g, "retrieve_snippets", lambda topic: [])
-    monkeypatch.setattr(g, "triage_route", lambda text, safety: {"content": "triage", "metadata": {}})
-    # Structured LLM returns our injected plan
     monkeypatch.setattr(g, "llm_structured", lambda history, schema: plan)
 
 
-def test_allows_jesus_when_ok(monkeypatch):
+def test_allows_jesus_when_ok(monkeypatch, orch):
     plan = _valid_plan(phase="advice", jesus_allowed=True)
     _patch_dependencies(monkeypatch, plan)
     st = _mk_state(turn_index=5, last_jesus_invite_turn=1, declined_jesus_until_turn=None)
-    md = Orchestrator().run(st)["metadata"]
+    md = orch.run(st)["metadata"]
     assert md["allow_jesus"] is True
     assert md["cadence_reason"] == "ok"
 
 
-def test_blocks_in_cooldown(monkeypatch):
+def test_blocks_in_cooldown(monkeypatch, orch):
     plan = _valid_plan(phase="advice", jesus_allowed=True)
     _patch_dependencies(monkeypatch, plan)
     st = _mk_state(turn_index=7, last_jesus_invite_turn=1, declined_jesus_until_turn=10)
-    md = Orchestrator().run(st)["metadata"]
+    md = orch.run(st)["metadata"]
     assert md["allow_jesus"] is False
     assert md["cadence_reason"] == "cooldown_declined"
     assert md["declined_jesus_until_turn"] == 10
 
 
-def test_blocks_in_cadence_window(monkeypatch):
+def test_blocks_in_cadence_window(monkeypatch, orch):
     plan = _valid_plan(phase="advice", jesus_allowed=True)
     _patch_dependencies(monkeypatch, plan)
     st = _mk_state(turn_index=6, last_jesus_invite_turn=4, declined_jesus_until_turn=None)
-    md = Orchestrator().run(st)["metadata"]
+    md = orch.run(st)["metadata"]
     assert md["allow_jesus"] is False
     assert md["cadence_reason"] == "cadence_window"
 
 
-def test_blocks_when_last_turn_had_jesus(monkeypatch):
+def test_blocks_when_last_turn_had_jesus(monkeypatch, orch):
     plan = _valid_plan(phase="advice", jesus_allowed=True)
     _patch_dependencies(monkeypatch, plan)
     st = _mk_state(turn_index=5, last_turn_had_jesus=True)
-    md = Orchestrator().run(st)["metadata"]
+    md = orch.run(st)["metadata"]
     assert md["allow_jesus"] is False
     assert md["cadence_reason"] == "last_turn_had_jesus"
 
 
-def test_blocks_in_intake_phase(monkeypatch):
+def test_blocks_in_intake_phase(monkeypatch, orch):
     plan = _valid_plan(phase="intake", jesus_allowed=True)
     _patch_dependencies(monkeypatch, plan)
     st = _mk_state(turn_index=5)
-    md = Orchestrator().run(st)["metadata"]
+    md = orch.run(st)["metadata"]
     assert md["allow_jesus"] is False
     assert md["cadence_reason"] == "phase_intake"
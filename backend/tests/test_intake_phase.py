@@ -2,14 +2,14 @@ import json
 from typing import Any, Dict
 
 import pytest
-from httpx import ASGITransport, AsyncClient
+from httpx import AsyncClient
 
 # Import the FastAPI app
-from backend.app.main import app
+from backend.app.main import app  # noqa: F401
 
 
 @pytest.fixture()
-async def client_legacy(monkeypatch):
+async def client_legacy(monkeypatch, fresh_db, asgi_transport, close_log_handlers):
     # Force orchestration OFF to exercise legacy compose path in ChatService.generate_response
     from backend.app import config as app_config
 
@@ -25,37 +25,9 @@ async def client_legacy(monkeypatch):
     # Patch get_settings used within ChatService
     monkeypatch.setattr("backend.app.services.chat.get_settings", fake_get_settings)
 
-    transport = ASGITransport(app=app)
-    try:
-        async with AsyncClient(transport=transport, base_url="http://testserver") as c:
-            yield c
-    finally:
-        # Explicit cleanup to emulate lifespan shutdown for older httpx versions
-        try:
-            from backend.app.db.base import SessionLocal, engine
-            SessionLocal.remove()
-            engine.dispose()
-        except Exception:
-            pass
-        # Close logging file handlers to avoid unclosed file warnings
-        import logging
-        try:
-            root_logger = logging.getLogger()
-            for h in list(root_logger.handlers):
-                try:
-                    h.flush()
-                except Exception:
-                    pass
-                try:
-                    h.close()
-                except Exception:
-                    pass
-                try:
-                    root_logger.removeHandler(h)
-                except Exception:
-                    pass
-        except Exception:
-            pass
+    # DB reset/release and log handler teardown come from the fresh_db/close_log_handlers fixtures
+    async with AsyncClient(transport=asgi_transport, base_url="http://testserver") as c:
+        yield c
 
 
 async def _post_chat(client, messages, conversation_id=None):
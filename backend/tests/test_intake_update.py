@@ -0,0 +1,36 @@
+from backend.app.services._intake_update import parse_children, parse_prior_counseling, update_meta_after_turn
+
+
+def test_update_meta_after_turn_extracts_signals_in_place():
+    meta = {"consent_for_prayer": False}
+    update_meta_after_turn(
+        meta,
+        "we've been married 12 years, 2 kids, and i'm a christian. trust is broken.",
+        "Let's start with transparency. Are you in a church? See John 15:5.",
+        consent_detected=False,
+    )
+    assert meta["marriage_years"] == 12
+    assert meta["marriage_stage"] == "long_term"
+    assert meta["children_count"] == 2 and meta["have_children"] is True
+    assert meta["faith_status"] == "christian"
+    assert meta["last_intent"] == "rebuilding_trust"
+    assert meta["last_scripture_used"] == "John 15:5"
+    assert meta["trust_rebuild_stage"] == "early_repair"
+    assert meta["consent_for_prayer"] is False
+
+
+def test_update_meta_after_turn_respects_faith_branching_flag():
+    meta = {}
+    update_meta_after_turn(meta, "i'm agnostic", "Are you a Christian?", consent_detected=True, faith_branching=False)
+    assert "faith_status" not in meta and "asked_faith_question" not in meta
+    assert meta["consent_for_prayer"] is True
+
+
+def test_children_and_counseling_helpers():
+    assert parse_children("no kids yet") == (False, 0)
+    assert parse_children("we have 3 children") == (True, 3)
+    assert parse_children("we're expecting") == (True, None)
+    assert parse_children("we argue a lot") == (None, None)
+    assert parse_prior_counseling("we tried counseling last year") is True
+    assert parse_prior_counseling("we've never done counseling") is False
+    assert parse_prior_counseling("we argue a lot") is None
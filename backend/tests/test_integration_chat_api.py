@@ -1,11 +1,35 @@
 import json
-from typing import Any, Dict
+from types import MappingProxyType
+from typing import Any, Mapping
 
 import pytest
-from httpx import ASGITransport, AsyncClient
+from httpx import AsyncClient
 
 # Import the FastAPI app
-from backend.app.main import app
+from backend.app.main import app  # noqa: F401
+
+
+def _frozen_reply(content: str, **metadata: Any) -> Mapping[str, Any]:
+    return MappingProxyType({"content": content, "metadata": MappingProxyType(metadata)})
+
+
+# Stub replies built once; read-only so a caller mutating one cannot leak into later turns or tests
+_INVITE_INITIAL = _frozen_reply(
+    "I hear you. Would you like to bring this to Jesus together this week?",
+    rooted_in_jesus_emphasis=True,
+    cadence_reason="invite_initial",
+)
+_INVITE_REPEAT = _frozen_reply(
+    "I hear you. Would you like to bring this to Jesus together this week?",
+    rooted_in_jesus_emphasis=True,
+    cadence_reason="invite_repeat",
+)
+_NEUTRAL = _frozen_reply(
+    "Thanks for sharing that. I'm here with you.",
+    rooted_in_jesus_emphasis=False,
+    cadence_reason="neutral_followup",
+)
+_REPLIES = (_INVITE_INITIAL, _INVITE_REPEAT, _NEUTRAL)
 
 
 class StubOrchestrator:
@@ -18,28 +42,13 @@ class StubOrchestrator:
     def __init__(self):
         self.calls = 0
 
-    def run(self, turn_state: Any) -> Dict[str, Any]:
+    def run(self, turn_state: Any) -> Mapping[str, Any]:
         self.calls += 1
-        if self.calls in (1, 2):
-            return {
-                "content": "I hear you. Would you like to bring this to Jesus together this week?",
-                "metadata": {
-                    "rooted_in_jesus_emphasis": True,
-                    "cadence_reason": "invite_initial" if self.calls == 1 else "invite_repeat",
-                },
-            }
-        # Neutral content afterwards
-        return {
-            "content": "Thanks for sharing that. I'm here with you.",
-            "metadata": {
-                "rooted_in_jesus_emphasis": False,
-                "cadence_reason": "neutral_followup",
-            },
-        }
+        return _REPLIES[min(self.calls, len(_REPLIES)) - 1]
 
 
 @pytest.fixture()
-async def client(monkeypatch):
+async def client(monkeypatch, fresh_db, asgi_transport, close_log_handlers):
     # Force orchestration ON and stable settings
     from backend.app import config as app_config
 
@@ -59,37 +68,9 @@ async def client(monkeypatch):
     stub = StubOrchestrator()
     monkeypatch.setattr("backend.app.services.chat.Orchestrator", lambda: stub)
 
-    transport = ASGITransport(app=app)
-    try:
-        async with AsyncClient(transport=transport, base_url="http://testserver") as c:
-            yield c
-    finally:
-        # Explicit cleanup to emulate lifespan shutdown for older httpx versions
-        try:
-            from backend.app.db.base import SessionLocal, engine
-            SessionLocal.remove()
-            engine.dispose()
-        except Exception:
-            pass
-        # Close logging file handlers to avoid unclosed file warnings
-        import logging
-        try:
-            root_logger = logging.getLogger()
-            for h in list(root_logger.handlers):
-                try:
-                    h.flush()
-                except Exception:
-                    pass
-                try:
-                    h.close()
-                except Exception:
-                    pass
-                try:
-                    root_logger.removeHandler(h)
-                except Exception:
-                    pass
-        except Exception:
-            pass
+    # DB reset/release and log handler teardown come from the fresh_db/close_log_handlers fixtures
+    async with AsyncClient(transport=asgi_transport, base_url="http://testserver") as c:
+        yield c
 
 
 async def _post_chat(client, messages, conversation_id=None):
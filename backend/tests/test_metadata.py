@@ -1,4 +1,4 @@
-from backend.app.orchestration.metadata import normalize_meta
+from backend.app.orchestration.metadata import normalize_meta, normalize_meta_inplace
 
 
 def test_normalize_meta_defaults_and_types():
@@ -35,3 +35,12 @@ def test_normalize_meta_coercions():
     assert md["allow_books"] is True
     assert md["allow_jesus"] is True
     assert md["cadence_reason"] == "ok"
+
+
+def test_normalize_meta_inplace_mutates_and_matches_copy():
+    src = {"topic_confidence": "0.5", "planner_retries": None}
+    expected = normalize_meta(src)
+    assert src == {"topic_confidence": "0.5", "planner_retries": None}
+    out = normalize_meta_inplace(src)
+    assert out is src
+    assert out == expected
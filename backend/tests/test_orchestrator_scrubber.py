@@ -1,3 +1,4 @@
+import copy
 import types
 from typing import Any, Dict, List
 
@@ -37,14 +38,18 @@ def _dummy_plan_with_resource() -> Any:
     return plan
 
 
+# Built once; each orchestrator call gets its own deep copy
+_RESOURCE_PLAN = _dummy_plan_with_resource()
+
+
 @pytest.fixture(autouse=True)
 def _isolate_imports(monkeypatch):
     # Ensure no external calls happen
     monkeypatch.setattr(graph_mod, "pre_moderate", lambda _: DummySafety(False))
     monkeypatch.setattr(graph_mod, "post_moderate", lambda s: s)
     monkeypatch.setattr(graph_mod, "classify", lambda _msg: {"topic": "marriage", "confidence": 0.9})
-    monkeypatch.setattr(graph_mod, "validate_response_plan", lambda _p: (True, []))
-    monkeypatch.setattr(graph_mod, "llm_structured", lambda **kwargs: _dummy_plan_with_resource())
+    monkeypatch.setattr(graph_mod, "validate_response_plan", lambda _p: (True, ()))
+    monkeypatch.setattr(graph_mod, "llm_structured", lambda **kwargs: copy.deepcopy(_RESOURCE_PLAN))
     # Retrieval should not be used when allow_books is False
     monkeypatch.setattr(graph_mod, "retrieve_snippets", lambda _t: [
         # Would have become sources if allowed; ensure disallowed path does not include
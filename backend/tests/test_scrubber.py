@@ -1,28 +1,10 @@
-import json
-from pathlib import Path
-
 import pytest
 
 from backend.app.orchestration.scrubber import scrub_books_if_gated
 
 
-def _load_marriage_rules():
-    repo_root = Path(__file__).resolve().parents[1]
-    rules_path = repo_root / "app" / "pastoral" / "rules" / "marriage.json"
-    with rules_path.open("r", encoding="utf-8") as f:
-        return json.load(f)
-
-
-def test_scrubber_noop_when_allowed():
-    text = "We recommend reading together and praying."
-    cleaned, scrubs = scrub_books_if_gated(text, allow_books=True)
-    assert cleaned == text
-    assert scrubs == []
-
-
-def test_scrubber_scrubs_known_title_if_gated():
-    data = _load_marriage_rules()
-    books = data.get("books") or []
+def test_scrubber_scrubs_known_title_if_gated(marriage_rules):
+    books = marriage_rules.get("books") or []
     if not books:
         pytest.skip("No books configured in marriage.json")
     pretty = (books[0].get("pretty") or books[0].get("title") or "").strip()
@@ -34,9 +16,8 @@ def test_scrubber_scrubs_known_title_if_gated():
     assert any(pretty.lower() in s.lower() for s in scrubs)
 
 
-def test_scrubber_scrubs_author_name_if_gated():
-    data = _load_marriage_rules()
-    books = data.get("books") or []
+def test_scrubber_scrubs_author_name_if_gated(marriage_rules):
+    books = marriage_rules.get("books") or []
     # Try to find any book with an author field
     author = None
     for b in books:
@@ -52,22 +33,29 @@ def test_scrubber_scrubs_author_name_if_gated():
     assert any(author.split()[0].lower() in s.lower() for s in scrubs)
 
 
-def test_scrubber_scrubs_generic_quoted_title():
-    text = 'Consider reading "A Made Up Title" together.'
-    cleaned, scrubs = scrub_books_if_gated(text, allow_books=False)
-    assert "[resource removed]" in cleaned
-    # Quoted title should appear in scrubs
-    assert any("made up title" in s.lower() for s in scrubs)
+def test_scrubber_noop_when_allowed():
+    text = "We recommend reading together and praying."
+    cleaned, scrubs = scrub_books_if_gated(text, allow_books=True)
+    assert cleaned == text
+    assert scrubs == []
 
 
-essay_texts = [
-    "This week, try the workbook titled \"Repairing Trust\".",
-    "Try the devotional by John Smith.",
+# (gated text, substring expected in one of the scrubbed snippets)
+SCRUB_CASES = [
+    ('Consider reading "A Made Up Title" together.', "made up title"),
+    ('This week, try the workbook titled "Repairing Trust".', "workbook titled"),
+    ("Try the devotional by John Smith.", "devotional by"),
 ]
 
 
-@pytest.mark.parametrize("txt", essay_texts)
-def test_scrubber_generic_patterns_cover_workbook_and_by_name(txt):
-    cleaned, scrubs = scrub_books_if_gated(txt, allow_books=False)
+@pytest.mark.parametrize("text,needle", SCRUB_CASES)
+def test_scrubber_matrix(text, needle):
+    cleaned, scrubs = scrub_books_if_gated(text, allow_books=False)
     assert "[resource removed]" in cleaned
-    assert len(scrubs) >= 1
+    assert any(needle in s.lower() for s in scrubs)
+
+
+def test_fused_generic_scan_does_not_rescan_placeholders():
+    cleaned, scrubs = scrub_books_if_gated("See https://example.org/x today.", False)
+    assert cleaned == "See [resource removed] today."
+    assert scrubs == ["https://example.org/x"]
@@ -1,30 +1,43 @@
-import os, json, urllib.request
-# read key from backend/.env
-key = ''
-with open('.\\.env','r',encoding='utf-8',errors='ignore') as f:
-    for line in f:
-        if line.startswith('OPENAI_API_KEY='):
-            key = line.split('=',1)[1].strip()
-            break
+import asyncio, json, os, sys, urllib.error, urllib.request
+from app.util.env import load_env_key
+# key from the environment, else backend/.env (once, outside the probe loop)
+key = os.environ.get('OPENAI_API_KEY') or load_env_key('OPENAI_API_KEY')
 print('KEYLEN', len(key), 'TAIL', key[-8:])
 # REST call
+URL = 'https://api.openai.com/v1/chat/completions'
 payload = {
     'model': 'gpt-4o-mini',
     'messages': [{'role':'user','content':'Ping one word.'}],
     'max_tokens': 5,
 }
 data = json.dumps(payload).encode('utf-8')
-req = urllib.request.Request(
-    'https://api.openai.com/v1/chat/completions',
-    data=data,
-    headers={'Authorization': f'Bearer {key}', 'Content-Type': 'application/json'},
-    method='POST'
-)
-try:
-    with urllib.request.urlopen(req) as resp:
-        body = resp.read().decode('utf-8','ignore')
-        print('OK', resp.status, body[:200])
-except Exception as e:
-    import traceback
-    print('ERR', type(e).__name__, str(e))
-    traceback.print_exc()
+# Number of probes (optional argument, default 1)
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+
+
+def probe():
+    req = urllib.request.Request(
+        URL,
+        data=data,
+        headers={'Authorization': f'Bearer {key}', 'Content-Type': 'application/json'},
+        method='POST'
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            return resp.status, resp.read().decode('utf-8','ignore')[:200]
+    except urllib.error.HTTPError as he:
+        return he.code, he.read().decode('utf-8','ignore')[:200]
+
+
+async def main():
+    # Probes are network-bound, so overlap them on worker threads instead of paying each round-trip in turn
+    results = await asyncio.gather(*(asyncio.to_thread(probe) for _ in range(N)), return_exceptions=True)
+    for res in results:
+        if isinstance(res, Exception):
+            print('ERR', type(res).__name__, str(res))
+        else:
+            status, body = res
+            print('OK' if status < 400 else 'ERR', status, body)
+
+
+asyncio.run(main())
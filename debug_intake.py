@@ -1,101 +1,143 @@
 #!/usr/bin/env python3
 
 import asyncio
-import sys
-import os
 import logging
+import os
+import sys
 
 # Add the backend directory to the path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+import backend._pathsetup  # noqa: F401,E402
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
 
 from backend.app.services.chat import get_chat_service
-from backend.app.db.base import SessionLocal
+from backend.app.db.base import SessionLocal, engine
 from backend.app.models.sql_models import Conversation as SQLConversation
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-async def test_intake_completion():
-    """Test intake completion persistence directly."""
+# The canned three-turn script run_one plays through the chat service
+DEBUG_TURNS = (
+    "We argue a lot lately.",
+    "What should I do next?",
+    "That's enough, I'm ready for advice.",
+)
+
+async def run_one(user_id: str = "debug-user"):
+    """Test intake completion persistence directly for one conversation.
+
+    The DEBUG_TURNS stay sequential (each depends on the previous one's persisted state);
+    returns one response per turn.
+    """
     
     # Initialize chat service
     chat_service = get_chat_service()
     
     # Create a conversation
-    conversation = await chat_service.create_conversation(user_id="debug-user")
+    conversation = await chat_service.create_conversation(user_id=user_id)
     conversation_id = conversation.id
     
-    print(f"Created conversation: {conversation_id}")
+    print(f"[{user_id}] Created conversation: {conversation_id}")
     
-    # Add initial user message
-    await chat_service.add_message(
-        conversation_id=conversation_id,
-        user_id="debug-user",
-        content="We argue a lot lately.",
-        role="user"
-    )
-    
-    # Generate first assistant response
-    response1 = await chat_service.generate_response(
-        conversation_id=conversation_id,
-        user_id="debug-user", 
-        message="We argue a lot lately."
-    )
-    
-    print(f"Response 1 metadata: {response1.metadata}")
-    
-    # Add another user message asking for advice
-    await chat_service.add_message(
-        conversation_id=conversation_id,
-        user_id="debug-user",
-        content="What should I do next?",
-        role="user"
-    )
-    
-    # Generate second assistant response (should trigger wrap-up gating)
-    response2 = await chat_service.generate_response(
-        conversation_id=conversation_id,
-        user_id="debug-user",
-        message="What should I do next?"
-    )
+    # Turn 2 should trigger wrap-up gating; turn 3's affirmation should flip intake completion
+    responses = []
+    for turn, message in enumerate(DEBUG_TURNS, 1):
+        await chat_service.add_message(
+            conversation_id=conversation_id,
+            user_id=user_id,
+            content=message,
+            role="user"
+        )
+        response = await chat_service.generate_response(
+            conversation_id=conversation_id,
+            user_id=user_id,
+            message=message
+        )
+        responses.append(response)
+        print(f"[{user_id}] Response {turn} metadata: {response.metadata}")
+        if turn > 1:
+            intake = response.metadata.get("intake", {})
+            print(f"[{user_id}] Response {turn} intake completed: {intake.get('completed')}")
     
-    print(f"Response 2 metadata: {response2.metadata}")
-    intake2 = response2.metadata.get("intake", {})
-    print(f"Response 2 intake completed: {intake2.get('completed')}")
-    
-    # Add wrap-up affirmation message
-    await chat_service.add_message(
-        conversation_id=conversation_id,
-        user_id="debug-user", 
-        content="That's enough, I'm ready for advice.",
-        role="user"
-    )
-    
-    # Generate third assistant response (should flip intake completion)
-    response3 = await chat_service.generate_response(
-        conversation_id=conversation_id,
-        user_id="debug-user",
-        message="That's enough, I'm ready for advice."
+    # Check conversation metadata in DB: one column, no ORM object, awaited rather than blocking
+    stmt = select(SQLConversation.metadata_json).where(SQLConversation.id == conversation_id)
+    if engine.url.get_backend_name() == "sqlite":
+        # Script-local aiosqlite engine on this coroutine's loop, disposed once the read is done
+        async_engine = create_async_engine(engine.url.set(drivername="sqlite+aiosqlite"))
+        try:
+            async with async_engine.connect() as conn:
+                found = (await conn.execute(stmt)).first()
+        finally:
+            await async_engine.dispose()
+    else:
+        def read_sync():
+            db = SessionLocal()
+            try:
+                return db.execute(stmt).first()
+            finally:
+                db.close()
+
+        found = await asyncio.to_thread(read_sync)
+    if found is not None:
+        conv_meta = found[0] or {}
+        intake_meta = conv_meta.get("intake", {})
+        print(f"[{user_id}] DB conversation metadata: {conv_meta}")
+        print(f"[{user_id}] DB intake completed: {intake_meta.get('completed')}")
+    else:
+        print(f"[{user_id}] No conversation found in DB")
+
+    return tuple(responses)
+
+
+async def run_many(n: int):
+    # Independent conversations only wait on the network, so run them concurrently. ChatService's
+    # OpenAI calls are blocking urlopen, so each conversation gets its own worker thread and loop
+    # (SessionLocal is thread-scoped); wall time is roughly the slowest conversation, not the sum.
+    return await asyncio.gather(
+        *(asyncio.to_thread(asyncio.run, run_one(f"debug-user-{i}")) for i in range(n))
     )
-    
-    print(f"Response 3 metadata: {response3.metadata}")
-    intake3 = response3.metadata.get("intake", {})
-    print(f"Response 3 intake completed: {intake3.get('completed')}")
-    
-    # Check conversation metadata in DB
-    db = SessionLocal()
-    try:
-        row = db.query(SQLConversation).filter(SQLConversation.id == conversation_id).first()
-        if row:
-            conv_meta = getattr(row, "metadata_json", {}) or {}
-            intake_meta = conv_meta.get("intake", {})
-            print(f"DB conversation metadata: {conv_meta}")
-            print(f"DB intake completed: {intake_meta.get('completed')}")
-        else:
-            print("No conversation found in DB")
-    finally:
-        db.close()
+
+
+def run_batch(n: int):
+    """Send the script for n debug users through the OpenAI Batch API (SHEPHERD_DEBUG_BATCH=1).
+
+    A batch cannot feed one turn's reply into the next, so each turn goes out as the cumulative
+    user-only history against the configured model; this exercises the model, not ChatService's
+    intake state machine. Results can take up to 24h.
+    """
+    from backend.app.config import get_settings
+    from backend.app.services.batch_runner import fetch_batch_results, submit_batch, wait_for_batch
+
+    model = get_settings().MODEL_NAME
+    requests = []
+    for i in range(n):
+        for turn in range(len(DEBUG_TURNS)):
+            requests.append({
+                "custom_id": f"debug-user-{i}:turn-{turn + 1}",
+                "body": {
+                    "model": model,
+                    "messages": [{"role": "user", "content": t} for t in DEBUG_TURNS[: turn + 1]],
+                },
+            })
+    handle = submit_batch(requests)
+    print(f"Submitted batch {handle.id} ({len(requests)} requests)")
+    handle = wait_for_batch(handle)
+    print(f"Batch {handle.id} finished: {handle.status}")
+    for custom_id, body in sorted(fetch_batch_results(handle).items()):
+        choices = body.get("choices") or []
+        content = (choices[0].get("message") or {}).get("content") if choices else body.get("error")
+        print(f"[{custom_id}] {content}")
+
 
 if __name__ == "__main__":
-    asyncio.run(test_intake_completion())
+    # Optional argument: number of concurrent debug conversations (default 1)
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    if os.environ.get("SHEPHERD_DEBUG_BATCH") == "1":
+        run_batch(n)
+    elif n == 1:
+        asyncio.run(run_one())
+    else:
+        asyncio.run(run_many(n))
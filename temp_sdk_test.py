@@ -1,14 +1,56 @@
-import json, sys
-from openai import OpenAI
-key = open('.env','r',encoding='utf-8',errors='ignore').read().split('OPENAI_API_KEY=',1)[1].splitlines()[0].strip()
-client = OpenAI(api_key=key)
-try:
-    resp = client.chat.completions.create(
-        model='gpt-4o-mini',
-        messages=[{'role':'user','content':'Say hi in one word.'}],
-        temperature=0.2,
-        max_tokens=10,
-    )
-    print('OK', json.dumps({'id':resp.id,'model':resp.model,'len':len(resp.choices)}))
-except Exception as e:
-    print('ERR', type(e).__name__, getattr(e,'status_code',None), getattr(e,'code',None), str(e))
+import argparse, asyncio, json, os
+from openai import AsyncOpenAI
+from backend.app.util.env import load_env_key
+key = os.environ.get('OPENAI_API_KEY') or load_env_key('OPENAI_API_KEY')
+client = AsyncOpenAI(api_key=key)
+
+CHAT_MESSAGES = [{'role':'user','content':'Say hi in one word.'}]
+
+
+async def ping(n=1):
+    try:
+        resp = await client.chat.completions.create(
+            model='gpt-4o-mini',
+            messages=CHAT_MESSAGES,
+            temperature=0.2,
+            max_tokens=10,
+            n=n,
+        )
+        print('OK', json.dumps({'id':resp.id,'model':resp.model,'len':len(resp.choices)}))
+    except Exception as e:
+        print('ERR', type(e).__name__, getattr(e,'status_code',None), getattr(e,'code',None), str(e))
+
+
+async def batch_ping(prompts):
+    """Send every prompt in one completions request (one RPM slot, one round-trip)."""
+    try:
+        resp = await client.completions.create(
+            model='gpt-3.5-turbo-instruct',
+            prompt=prompts,
+            max_tokens=5,
+        )
+        # Choices are not guaranteed to come back in prompt order; choice.index maps them back
+        for choice in sorted(resp.choices, key=lambda c: c.index):
+            print('OK', json.dumps({'prompt':prompts[choice.index],'text':choice.text.strip()}))
+    except Exception as e:
+        print('ERR', type(e).__name__, getattr(e,'status_code',None), getattr(e,'code',None), str(e))
+
+
+async def main(args):
+    if args.batch:
+        # Distinct prompts share one completions request; the repeated chat ping becomes one request with n=count
+        if args.prompts:
+            await batch_ping(args.prompts)
+        await ping(n=args.count)
+    else:
+        # Concurrent pings share the client's connection pool
+        await asyncio.gather(*(ping() for _ in range(args.count)))
+    await client.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='OpenAI SDK connectivity probe')
+    parser.add_argument('count', nargs='?', type=int, default=1, help='number of chat pings (default 1)')
+    parser.add_argument('--batch', action='store_true', help='batch pings into as few requests as possible')
+    parser.add_argument('--prompt', dest='prompts', action='append', default=[], help='prompt for --batch (repeatable)')
+    asyncio.run(main(parser.parse_args()))